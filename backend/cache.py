@@ -0,0 +1,100 @@
+import asyncio
+import functools
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_SCHEMA_TTL = 60  # Seconds a schema introspection result stays fresh
+DEFAULT_VERSION_INTERVAL = 5  # Seconds a cached result is trusted before its version is re-probed
+
+# (function name, call arguments) -> (expires_at, stored_at, verified_at, version token, result)
+_SchemaCache: Dict[Hashable, Tuple[float, float, float, Any, Any]] = {}
+_inflight_locks: Dict[Hashable, asyncio.Lock] = {}
+
+def schema_cache_ttl(default: float = DEFAULT_SCHEMA_TTL) -> float:
+    """Read the CACHE_SCHEMA override: a number of seconds, or 'false' to disable"""
+    value = os.environ.get("CACHE_SCHEMA", "").strip().lower()
+    if not value:
+        return default
+    if value in ("false", "off", "no", "0"):
+        return 0
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+def _purge_expired(now: float) -> None:
+    for key in [k for k, entry in _SchemaCache.items() if entry[0] <= now]:
+        del _SchemaCache[key]
+
+def ttl_cache(
+    ttl: float = DEFAULT_SCHEMA_TTL,
+    jitter: float = 0.05,
+    version: Optional[Callable[..., Awaitable[Hashable]]] = None,
+    version_interval: float = DEFAULT_VERSION_INTERVAL
+) -> Callable:
+    """Cache an async function's result per argument tuple for `ttl` seconds.
+
+    Concurrent callers with the same arguments share a single in-flight call
+    (singleflight), and expiry is jittered so entries don't all lapse at once.
+    When `version` is given it is awaited with the same arguments on a hit
+    at most once per `version_interval` seconds and must return a cheap
+    token (e.g. the catalog's last DDL time); a changed token invalidates
+    the entry before its TTL runs out.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            effective_ttl = schema_cache_ttl(ttl)
+            if effective_ttl <= 0:
+                return await func(*args, **kwargs)
+
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            token = None
+            entry = _SchemaCache.get(key)
+            now = time.monotonic()
+            if entry and entry[0] > now:
+                if version is None or now - entry[2] < version_interval:
+                    return entry[4]
+                token = await version(*args, **kwargs)
+                if token == entry[3]:
+                    if _SchemaCache.get(key) is entry:
+                        _SchemaCache[key] = (entry[0], entry[1], time.monotonic(), entry[3], entry[4])
+                    return entry[4]
+
+            waiting_since = time.monotonic()
+            lock = _inflight_locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    # Another caller may have refreshed the entry while we waited
+                    entry = _SchemaCache.get(key)
+                    if (
+                        entry and entry[0] > time.monotonic()
+                        and (version is None or entry[1] >= waiting_since or entry[3] == token)
+                    ):
+                        return entry[4]
+
+                    if version is not None and token is None:
+                        token = await version(*args, **kwargs)
+                    result = await func(*args, **kwargs)
+                    now = time.monotonic()
+                    _purge_expired(now)
+                    _SchemaCache[key] = (
+                        now + effective_ttl * (1 + random.uniform(-jitter, jitter)),
+                        now,
+                        now,
+                        token,
+                        result
+                    )
+                    return result
+            finally:
+                if not lock.locked():
+                    _inflight_locks.pop(key, None)
+
+        return wrapper
+    return decorator
+
+def invalidate_schema_cache() -> None:
+    """Drop every cached schema, e.g. after a connection is edited or removed"""
+    _SchemaCache.clear()
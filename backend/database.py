@@ -1,233 +1,353 @@
-import sqlite3
-from typing import List, Optional
+import asyncio
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import aiosqlite
 import pyodbc
 import cx_Oracle
 import os
 from models import DatabaseTable, DatabaseColumn
+from cache import ttl_cache
+from pool import get_oracle_pool, init_oracle_client, mssql_connection, oracle_call_timeout_supported, ORACLE_POOL_MAX
+from sqlnames import oracle_table_identifier
+
+logger = logging.getLogger(__name__)
 
-# Initialize Oracle client once at module level
-os.environ["NLS_LANG"] = ".AL32UTF8"
 try:
-    cx_Oracle.init_oracle_client()
-except Exception as e:
-    if "Oracle Client library has already been initialized" not in str(e):
-        raise
+    # Optional: decodes wide catalog result sets into Arrow batches in C
+    from arrow_odbc import read_arrow_batches_from_odbc
+except ImportError:
+    read_arrow_batches_from_odbc = None
+
+init_oracle_client()
+
+# Exact view counts stop here; the UI only shows an approximate total
+ORACLE_COUNT_CAP = int(os.environ.get("ORACLE_COUNT_CAP", "1000000"))
+
+# View counts move far slower than anyone browses, so they outlive the schema cache
+ORACLE_COUNT_TTL = 300
+
+# A single exact count gives up after this long rather than hold a pooled session
+ORACLE_COUNT_TIMEOUT_MS = 30000
+
+# Counted views remembered at once; expired entries go first, then the oldest
+ORACLE_COUNT_CACHE_SIZE = 10000
+
+# (dsn, schema, view) -> (expires_at, row_count); written from the count workers
+_view_count_cache: Dict[Tuple[str, str, str], Tuple[float, int]] = {}
+_view_count_lock = threading.Lock()
+
+# Runs the per-view row counts of search_oracle_views in parallel
+_count_executor = ThreadPoolExecutor(max_workers=ORACLE_POOL_MAX)
+
+# oracle_maintained (12c+, as is OFFSET/FETCH) drops SYS, XDB and the other
+# built-in schemas without a hard-coded owner list. Views have no optimizer
+# row statistics, so only an exact count can fill in their row totals. Pages
+# continue either from the last (owner, name) seen, which is an index range
+# seek, or by offset
+_ORACLE_VIEWS_SQL = """
+    SELECT /*+ FIRST_ROWS(10) */
+        ao.owner AS schema_name,
+        ao.object_name AS table_name
+    FROM all_objects ao
+    WHERE ao.object_type = 'VIEW'
+    AND (:search IS NULL OR UPPER(ao.object_name) LIKE UPPER(:search))
+    AND ao.oracle_maintained = 'N'
+    AND (
+        :after_schema IS NULL
+        OR ao.owner > :after_schema
+        OR (ao.owner = :after_schema AND ao.object_name > :after_name)
+    )
+    ORDER BY ao.owner, ao.object_name
+    OFFSET :row_offset ROWS FETCH NEXT :row_limit ROWS ONLY
+"""
+
+# The view page is limited once, then joined to its columns, so a search
+# costs a single round-trip and a single pass over the page query; views
+# without columns still come back, with NULL column fields
+_ORACLE_SEARCH_SQL = f"""
+    WITH page AS ({_ORACLE_VIEWS_SQL})
+    SELECT
+        p.schema_name,
+        p.table_name,
+        c.column_name,
+        c.data_type,
+        c.nullable,
+        c.data_length,
+        c.char_length
+    FROM page p
+    LEFT JOIN all_tab_columns c ON c.owner = p.schema_name AND c.table_name = p.table_name
+    ORDER BY p.schema_name, p.table_name, c.column_id
+"""
+
+# Heaps keep their rows under index 0 and clustered tables under index 1;
+# summing across partitions gives one row per table
+_MSSQL_TABLES_SQL = """
+    SELECT 
+        t.object_id,
+        s.name AS schema_name,
+        t.name AS table_name,
+        SUM(p.rows) AS row_count
+    FROM sys.tables t
+    INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
+    INNER JOIN sys.partitions p ON t.object_id = p.object_id AND p.index_id IN (0, 1)
+    GROUP BY t.object_id, s.name, t.name
+"""
+
+_MSSQL_VIEWS_SQL = """
+    SELECT 
+        v.object_id,
+        s.name AS schema_name,
+        v.name AS table_name,
+        0 AS row_count
+    FROM sys.views v
+    INNER JOIN sys.schemas s ON v.schema_id = s.schema_id
+"""
+
+# The primary-key map is a CTE so it is built once and hash-joined
+# against the whole column list; rows are keyed by object_id, which the
+# tables and views queries carry, so no names need resolving here
+_MSSQL_COLUMNS_SQL = """
+    WITH pk AS (
+        SELECT ic.object_id, ic.column_id
+        FROM sys.index_columns ic
+        INNER JOIN sys.indexes i ON ic.object_id = i.object_id 
+        AND ic.index_id = i.index_id
+        WHERE i.is_primary_key = 1
+    )
+    SELECT 
+        c.object_id,
+        c.name AS column_name,
+        t.name AS data_type,
+        c.is_nullable,
+        CAST(CASE WHEN pk.column_id IS NOT NULL THEN 1 ELSE 0 END AS BIT) AS is_primary_key
+    FROM sys.columns c
+    INNER JOIN sys.objects o ON c.object_id = o.object_id
+    INNER JOIN sys.types t ON c.user_type_id = t.user_type_id
+    LEFT JOIN pk ON c.object_id = pk.object_id AND c.column_id = pk.column_id
+    WHERE o.type IN ('U', 'V')
+    ORDER BY c.object_id, c.column_id
+"""
+
+# Identifiers can't be bound, so these are formatted with the quoted
+# "schema"."view" name; the rest of the text stays fixed
+_ORACLE_CAPPED_COUNT_SQL = """
+    SELECT COUNT(*) FROM (
+        SELECT 1 FROM {view}
+        WHERE ROWNUM <= :row_cap
+    )
+"""
+
+_SQLITE_SCHEMA_SQL = """
+    SELECT m.name, m.type, p.name, p.type, p."notnull", p.pk
+    FROM sqlite_master m
+    JOIN pragma_table_info(m.name) p
+    WHERE m.type IN ('table', 'view')
+    AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, p.cid
+"""
+
+# Rows pulled per fetchmany call when streaming catalog cursors
+CURSOR_ARRAYSIZE = 500
+
+def _iter_batches(cursor):
+    """Yield a cursor's rows, fetching them an arraysize batch at a time"""
+    while True:
+        batch = cursor.fetchmany(cursor.arraysize)
+        if not batch:
+            break
+        yield from batch
+
+def _iter_mssql_columns(connection_string: str):
+    """Yield column rows for every table and view, columnar when arrow-odbc is installed"""
+    if read_arrow_batches_from_odbc is None:
+        with mssql_connection(connection_string, timeout=10) as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = CURSOR_ARRAYSIZE
+            cursor.execute(_MSSQL_COLUMNS_SQL)
+            yield from _iter_batches(cursor)
+            cursor.close()
+        return
+    
+    # arrow-odbc opens its own connection, so no pooled one is borrowed
+    reader = read_arrow_batches_from_odbc(
+        query=_MSSQL_COLUMNS_SQL,
+        connection_string=connection_string,
+        batch_size=10000
+    )
+    reader.fetch_concurrently()
+    for batch in reader:
+        yield from zip(*(column.to_pylist() for column in batch.columns))
 
+# Cheap catalog fingerprints used to invalidate cached schemas early: a
+# dropped object lowers the count, any DDL on a table or view bumps its
+# modify_date
+_MSSQL_SCHEMA_VERSION_SQL = """
+    SELECT COUNT(*), MAX(modify_date)
+    FROM sys.objects
+    WHERE type IN ('U', 'V')
+"""
+
+async def _mssql_schema_version(connection_string: str):
+    return await asyncio.to_thread(_mssql_schema_version_sync, connection_string)
+
+def _mssql_schema_version_sync(connection_string: str):
+    with mssql_connection(connection_string, timeout=10) as conn:
+        cursor = conn.cursor()
+        cursor.execute(_MSSQL_SCHEMA_VERSION_SQL)
+        token = tuple(cursor.fetchone())
+        cursor.close()
+    return token
+
+async def _sqlite_schema_version(database_path: str) -> int:
+    async with aiosqlite.connect(database_path) as conn:
+        async with conn.execute("PRAGMA schema_version") as cursor:
+            return (await cursor.fetchone())[0]
+
+@ttl_cache(ttl=60, jitter=0.05, version=_mssql_schema_version)
 async def fetch_mssql_schema(connection_string: str) -> List[DatabaseTable]:
     tables = []
     try:
-        conn = pyodbc.connect(connection_string, timeout=10)
-        cursor = conn.cursor()
-        
-        # Query to get tables, views and their row counts
-        cursor.execute("""
-            SELECT 
-                s.name AS schema_name,
-                t.name AS table_name,
-                t.type_desc AS object_type,
-                p.rows AS row_count
-            FROM sys.tables t
-            INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
-            INNER JOIN sys.indexes i ON t.object_id = i.object_id
-            INNER JOIN sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
-            WHERE i.index_id <= 1
-            UNION ALL
-            SELECT 
-                s.name AS schema_name,
-                v.name AS table_name,
-                v.type_desc AS object_type,
-                0 AS row_count
-            FROM sys.views v
-            INNER JOIN sys.schemas s ON v.schema_id = s.schema_id
-            ORDER BY schema_name, table_name
-        """)
+        # Tables, views and columns are independent queries, so each runs
+        # on its own pooled connection at the same time
+        tables_data, views_data, columns_by_table = await asyncio.gather(
+            asyncio.to_thread(_fetch_mssql_rows_sync, connection_string, _MSSQL_TABLES_SQL),
+            asyncio.to_thread(_fetch_mssql_rows_sync, connection_string, _MSSQL_VIEWS_SQL),
+            asyncio.to_thread(_fetch_mssql_columns_sync, connection_string)
+        )
         
-        tables_data = cursor.fetchall()
-        
-        for table in tables_data:
-            schema_name, table_name, object_type, row_count = table
-            
-            # Get columns for this table
-            cursor.execute("""
-                SELECT 
-                    c.name AS column_name,
-                    t.name AS data_type,
-                    c.is_nullable,
-                    CASE WHEN pk.column_id IS NOT NULL THEN 1 ELSE 0 END AS is_primary_key
-                FROM sys.columns c
-                INNER JOIN sys.types t ON c.user_type_id = t.user_type_id
-                LEFT JOIN (
-                    SELECT ic.column_id, ic.object_id
-                    FROM sys.index_columns ic
-                    INNER JOIN sys.indexes i ON ic.object_id = i.object_id 
-                    AND ic.index_id = i.index_id
-                    WHERE i.is_primary_key = 1
-                ) pk ON c.object_id = pk.object_id AND c.column_id = pk.column_id
-                WHERE c.object_id = OBJECT_ID(?)
-                ORDER BY c.column_id
-            """, [f"{schema_name}.{table_name}"])
-            
-            columns = []
-            for col in cursor.fetchall():
-                column_name, data_type, is_nullable, is_primary_key = col
-                columns.append(DatabaseColumn(
-                    name=column_name,
-                    type=data_type,
-                    nullable=bool(is_nullable),
-                    isPrimaryKey=bool(is_primary_key),
-                    selected=True
-                ))
-            
-            tables.append(DatabaseTable(
+        # Interleave tables and views the way the catalog's case-insensitive
+        # ORDER BY used to
+        objects = sorted(tables_data + views_data, key=lambda row: (row[1].lower(), row[2].lower()))
+        for object_id, schema_name, table_name, row_count in objects:
+            tables.append(DatabaseTable.model_construct(
                 name=table_name,
                 schema=schema_name,
                 rowCount=row_count,
-                columns=columns,
+                columns=columns_by_table.get(object_id, []),
                 selected=False
             ))
         
-        cursor.close()
-        conn.close()
-        
         return tables
     except Exception as e:
         raise Exception(f"Error fetching MSSQL schema: {str(e)}")
 
+def _fetch_mssql_rows_sync(connection_string: str, sql: str) -> list:
+    with mssql_connection(connection_string, timeout=10) as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        cursor.close()
+    return rows
+
+def _fetch_mssql_columns_sync(connection_string: str) -> Dict[int, List[DatabaseColumn]]:
+    # Get columns for every table and view in a single round-trip
+    columns_by_table = {}
+    for object_id, column_name, data_type, is_nullable, is_primary_key in _iter_mssql_columns(connection_string):
+        columns_by_table.setdefault(object_id, []).append(DatabaseColumn.model_construct(
+            name=column_name,
+            type=sys.intern(data_type),
+            nullable=bool(is_nullable),
+            isPrimaryKey=bool(is_primary_key),
+            selected=True
+        ))
+    return columns_by_table
+
+@ttl_cache(ttl=60, jitter=0.05)
 async def search_oracle_views(
     connection_string: str,
     search: Optional[str] = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    exact_count: bool = False,
+    after_schema: Optional[str] = None,
+    after_name: Optional[str] = None
+) -> List[DatabaseTable]:
+    return await asyncio.to_thread(
+        _search_oracle_views_sync, connection_string, search, limit, offset, exact_count, after_schema, after_name
+    )
+
+def _search_oracle_views_sync(
+    connection_string: str,
+    search: Optional[str],
+    limit: int,
+    offset: int,
+    exact_count: bool,
+    after_schema: Optional[str],
+    after_name: Optional[str]
 ) -> List[DatabaseTable]:
     tables = []
+    pool = None
     conn = None
     cursor = None
     
     try:
-        conn = cx_Oracle.connect(connection_string)
+        pool = get_oracle_pool(connection_string)
+        conn = pool.acquire()
         cursor = conn.cursor()
         
-        # Configure session for large data
-        cursor.execute("ALTER SESSION SET NLS_LENGTH_SEMANTICS = 'CHAR'")
-        cursor.execute("ALTER SESSION SET NLS_DATE_FORMAT = 'YYYY-MM-DD HH24:MI:SS'")
         cursor.arraysize = 1000  # Fetch 1000 rows at a time
         
-        # Set large buffer size for CLOB/LONG columns
-        cursor.setinputsizes(None, cx_Oracle.CLOB)
-        
-        # Build the search condition with proper parameter binding
-        where_clause = "WHERE object_type = 'VIEW'"
-        bind_vars = []
-        
-        if search:
-            where_clause += " AND UPPER(object_name) LIKE UPPER(:1)"
-            bind_vars.append(f"%{search}%")  # Using positional binding
+        # A single statement text for every search keeps one shared cursor
+        # in the library cache
+        cursor.execute(_ORACLE_SEARCH_SQL, dict(
+            search=f"%{search}%" if search else None,
+            after_schema=after_schema,
+            after_name=after_name,
+            row_offset=offset,
+            row_limit=limit
+        ))
         
-        # Get list of views with optimized query
-        query = f"""
-            SELECT /*+ FIRST_ROWS({limit}) */
-                owner AS schema_name,
-                object_name AS table_name
-            FROM all_objects
-            {where_clause}
-            AND owner NOT IN (
-                'SYS', 'SYSTEM', 'OUTLN', 'DIP', 'ORACLE_OCM', 'DBSNMP', 'APPQOSSYS',
-                'WMSYS', 'EXFSYS', 'CTXSYS', 'XDB', 'ANONYMOUS', 'ORDSYS', 'ORDDATA',
-                'ORDPLUGINS', 'SI_INFORMTN_SCHEMA', 'MDSYS', 'OLAPSYS', 'MDDATA',
-                'SPATIAL_WFS_ADMIN_USR', 'SPATIAL_CSW_ADMIN_USR', 'SYSMAN', 'MGMT_VIEW',
-                'APEX_030200', 'FLOWS_FILES', 'APEX_PUBLIC_USER', 'OWBSYS', 'OWBSYS_AUDIT'
-            )
-            ORDER BY owner, object_name
-            OFFSET :2 ROWS FETCH NEXT :3 ROWS ONLY
-        """
-        
-        bind_vars.extend([offset, limit])
-        
-        cursor.execute(query, bind_vars)
-        tables_data = cursor.fetchall()
-        
-        for table in tables_data:
-            schema_name, table_name = table
+        # Rows arrive grouped by view, in page order
+        columns_by_view = {}
+        for schema_name, table_name, column_name, data_type, nullable, data_length, char_length in cursor:
+            columns = columns_by_view.setdefault((schema_name, table_name), [])
+            if column_name is None:
+                continue
             
-            # Get columns for this view
-            cursor.execute("""
-                SELECT 
-                    column_name,
-                    data_type,
-                    nullable,
-                    data_length,
-                    char_length
-                FROM all_tab_columns
-                WHERE owner = :1
-                AND table_name = :2
-                ORDER BY column_id
-            """, [schema_name, table_name])
+            # Adjust data type description for large text fields
+            if data_type in ('VARCHAR2', 'CHAR', 'NVARCHAR2', 'NCHAR'):
+                type_desc = f"{data_type}({char_length})"
+            elif data_type == 'NUMBER' and data_length:
+                type_desc = f"{data_type}({data_length})"
+            else:
+                type_desc = data_type
             
-            columns = []
-            for col in cursor.fetchall():
-                column_name, data_type, nullable, data_length, char_length = col
-                # Adjust data type description for large text fields
-                if data_type in ('VARCHAR2', 'CHAR', 'NVARCHAR2', 'NCHAR'):
-                    type_desc = f"{data_type}({char_length})"
-                elif data_type == 'NUMBER' and data_length:
-                    type_desc = f"{data_type}({data_length})"
-                else:
-                    type_desc = data_type
-                
-                columns.append(DatabaseColumn(
-                    name=column_name,
-                    type=type_desc,
-                    nullable=(nullable == 'Y'),
-                    isPrimaryKey=False,
-                    selected=True
-                ))
-            
-            # Get the full row count for the view
-            row_count = 0
-            try:
-                cursor.execute("""
-                    SELECT num_rows 
-                    FROM all_tables 
-                    WHERE owner = :1
-                    AND table_name = :2
-                """, [schema_name, table_name])
-                
-                count_result = cursor.fetchone()
-                
-                if not count_result or count_result[0] is None:
-                    cursor.execute("ALTER SESSION SET QUERY_REWRITE_ENABLED = TRUE")
-                    cursor.execute("ALTER SESSION SET NLS_LENGTH_SEMANTICS = 'CHAR'")
-                    
-                    try:
-                        cursor.execute("BEGIN DBMS_SESSION.SET_STATEMENT_TIMEOUT(30000); END;")
-                    except:
-                        pass
-                    
-                    # For identifiers like schema and table names, we need to use 
-                    # string formatting - but must sanitize the identifiers first
-                    # to prevent SQL injection
-                    def is_valid_identifier(name):
-                        return all(c.isalnum() or c == '_' or c == '$' or c == '#' for c in name)
-                    
-                    if is_valid_identifier(schema_name) and is_valid_identifier(table_name):
-                        # Get actual row count without ROWNUM limitation
-                        count_query = f"SELECT COUNT(*) FROM {schema_name}.{table_name}"
-                        cursor.execute(count_query)
-                        count_result = cursor.fetchone()
-                    else:
-                        # Skip count for potentially unsafe identifiers
-                        pass
-                    
-                if count_result and count_result[0] is not None:
-                    row_count = count_result[0]
-            except Exception:
-                pass
-            
-            tables.append(DatabaseTable(
+            # Type names repeat across thousands of cached columns; share one string each
+            columns.append(DatabaseColumn.model_construct(
+                name=column_name,
+                type=sys.intern(type_desc),
+                nullable=(nullable == 'Y'),
+                isPrimaryKey=False,
+                selected=True
+            ))
+        tables_data = list(columns_by_view)
+        
+        # Hand the search session back before counting so the count
+        # workers can never starve waiting on it
+        cursor.close()
+        cursor = None
+        pool.release(conn)
+        conn = None
+
+        # Views are counted only on request, concurrently on their own
+        # pooled sessions
+        row_counts = [None] * len(tables_data)
+        if exact_count:
+            row_counts = list(_count_executor.map(
+                lambda view: _count_oracle_view(pool, *view),
+                tables_data
+            ))
+        
+        for (schema_name, table_name), row_count in zip(tables_data, row_counts):
+            tables.append(DatabaseTable.model_construct(
                 name=table_name,
                 schema=schema_name,
                 rowCount=row_count,
-                columns=columns,
+                columns=columns_by_view.get((schema_name, table_name), []),
                 selected=False
             ))
         
@@ -253,63 +373,110 @@ async def search_oracle_views(
                 pass
         if conn:
             try:
-                conn.close()
+                pool.release(conn)
             except:
                 pass
 
-async def fetch_oracle_schema(connection_string: str) -> List[DatabaseTable]:
-    # For Oracle, we'll use the search endpoint instead
-    # This function now returns an empty list
-    return []
+def _count_oracle_view(pool, schema_name: str, table_name: str) -> Optional[int]:
+    """Get the exact (capped) row count for a view, cached for a few minutes"""
+    key = (pool.dsn, schema_name, table_name)
+    cached = _view_count_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    row_count = _query_oracle_view_count(pool, schema_name, table_name)
+    if row_count:  # Zero may be a failed count; empty views are cheap to recount
+        _store_view_count(key, row_count)
+    return row_count
+
+def _store_view_count(key: Tuple[str, str, str], row_count: int) -> None:
+    now = time.monotonic()
+    with _view_count_lock:
+        if len(_view_count_cache) >= ORACLE_COUNT_CACHE_SIZE:
+            for stale in [k for k, (expires_at, _) in _view_count_cache.items() if expires_at <= now]:
+                del _view_count_cache[stale]
+            while len(_view_count_cache) >= ORACLE_COUNT_CACHE_SIZE:
+                del _view_count_cache[next(iter(_view_count_cache))]
+        _view_count_cache[key] = (now + ORACLE_COUNT_TTL, row_count)
 
+def _query_oracle_view_count(pool, schema_name: str, table_name: str) -> Optional[int]:
+    # Quoting keeps lowercase and special-character names exact and leaves
+    # nothing in them to inject
+    view = oracle_table_identifier(table_name, schema_name)
+    timed = oracle_call_timeout_supported()
+    try:
+        conn = pool.acquire()
+    except cx_Oracle.Error as e:
+        logger.warning(f"Counting {view} failed to acquire a session: {str(e)}")
+        return None
+    try:
+        if timed:
+            conn.call_timeout = ORACLE_COUNT_TIMEOUT_MS
+        cursor = conn.cursor()
+        try:
+            # Bounded scan: stops after the cap instead of reading the whole view
+            cursor.execute(_ORACLE_CAPPED_COUNT_SQL.format(view=view), row_cap=ORACLE_COUNT_CAP)
+            count_result = cursor.fetchone()
+            return count_result[0] if count_result else None
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.warning(f"Counting {view} failed: {str(e)}")
+        return None
+    finally:
+        reusable = True
+        try:
+            if timed:
+                conn.call_timeout = 0  # Don't leak the limit to the session's next user
+        except cx_Oracle.Error as e:
+            reusable = False
+            logger.warning(f"Resetting call_timeout after counting {view} failed: {str(e)}")
+        try:
+            if reusable:
+                pool.release(conn)
+            else:
+                pool.drop(conn)
+        except cx_Oracle.Error as e:
+            logger.warning(f"Releasing the session after counting {view} failed: {str(e)}")
+
+@ttl_cache(ttl=60, jitter=0.05, version=_sqlite_schema_version)
 async def fetch_sqlite_schema(database_path: str) -> List[DatabaseTable]:
     tables = []
     try:
-        conn = sqlite3.connect(database_path)
-        cursor = conn.cursor()
-        
-        # Get all tables and views
-        cursor.execute("""
-            SELECT name, type 
-            FROM sqlite_master 
-            WHERE type IN ('table', 'view')
-            AND name NOT LIKE 'sqlite_%'
-            ORDER BY name
-        """)
-        
-        for table_name, table_type in cursor.fetchall():
-            # Get columns for this table/view
-            cursor.execute(f"PRAGMA table_info('{table_name}')")
-            
-            columns = []
-            for col in cursor.fetchall():
-                cid, name, type_, notnull, dflt_value, pk = col
-                columns.append(DatabaseColumn(
-                    name=name,
-                    type=type_,
-                    nullable=not bool(notnull),
-                    isPrimaryKey=bool(pk),
-                    selected=True
-                ))
-            
-            # Get approximate row count
+        # Async iteration pulls this many rows per hop to the connection's thread
+        async with aiosqlite.connect(database_path, iter_chunk_size=CURSOR_ARRAYSIZE) as conn:
+            # Row estimates left behind by ANALYZE; the first field of stat is the row count
+            row_estimates = {}
             try:
-                cursor.execute(f"SELECT COUNT(*) FROM '{table_name}'")
-                row_count = cursor.fetchone()[0]
-            except:
-                row_count = 0
+                async with conn.execute("SELECT tbl, stat FROM sqlite_stat1") as cursor:
+                    async for tbl, stat in cursor:
+                        if stat:
+                            row_estimates.setdefault(tbl, int(stat.split()[0]))
+            except aiosqlite.OperationalError:
+                pass  # ANALYZE has never been run on this database
             
-            tables.append(DatabaseTable(
+            # Get all tables and views with their columns in a single statement
+            columns_by_table = {}
+            async with conn.execute(_SQLITE_SCHEMA_SQL) as cursor:
+                async for table_name, _, name, type_, notnull, pk in cursor:
+                    columns_by_table.setdefault(table_name, []).append(DatabaseColumn.model_construct(
+                        name=name,
+                        type=sys.intern(type_),
+                        nullable=not bool(notnull),
+                        isPrimaryKey=bool(pk),
+                        selected=True
+                    ))
+        
+        for table_name, columns in columns_by_table.items():
+            tables.append(DatabaseTable.model_construct(
                 name=table_name,
                 schema=None,
-                rowCount=row_count,
+                # Row count only where ANALYZE left one; never scan the table
+                rowCount=row_estimates.get(table_name),
                 columns=columns,
                 selected=False
             ))
         
-        cursor.close()
-        conn.close()
-        
         return tables
     except Exception as e:
-        raise Exception(f"Error fetching SQLite schema: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Error fetching SQLite schema: {str(e)}")
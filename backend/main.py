@@ -1,22 +1,31 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import ORJSONResponse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
 import sqlite3
+import time
+import queue
+import threading
 import cx_Oracle
 import pyodbc
 from models import Connection, DatabaseTable, SearchParams, MigrationRequest
 from database import (
     fetch_mssql_schema, 
-    fetch_oracle_schema, 
     fetch_sqlite_schema,
     search_oracle_views
 )
-from migration import extract_table_chunks, import_chunk
+from migration import migrate_staged, stream_table
+from cache import invalidate_schema_cache
 import logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# orjson encodes the plain dict/list endpoint payloads in C
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS middleware configuration
 app.add_middleware(
@@ -27,29 +36,114 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Long-lived handles to the app database; each keeps its page cache and
+# prepared statements warm, and WAL lets them read concurrently
+APP_DB_POOL_SIZE = int(os.environ.get("APP_DB_POOL_SIZE", "4"))
+
+def _open_app_db() -> sqlite3.Connection:
+    conn = sqlite3.connect('connections.db', check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # WAL with synchronous=NORMAL commits without an fsync per write
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-20000')
+    return conn
+
+_app_db_pool = queue.Queue()
+for _ in range(APP_DB_POOL_SIZE):
+    _app_db_pool.put(_open_app_db())
+
+# SQLite takes one writer at a time anyway; queueing writes on a dedicated
+# handle keeps them from contending with readers for the pool
+_app_db_writer = _open_app_db()
+_app_db_writer_lock = threading.Lock()
+
+@contextmanager
+def app_db():
+    """Borrow a connections.db handle from the pool"""
+    conn = _app_db_pool.get()
+    try:
+        yield conn
+    finally:
+        _app_db_pool.put(conn)
+
+# Saved connections change only through execute_app_db, which clears this
+CONNECTION_CACHE_TTL = 60
+_connection_cache: Dict[str, Tuple[float, dict]] = {}
+_connection_writes = 0  # Bumped per write so a read racing it isn't cached
+
+# The helpers below block on the pool and the file, so handlers call them
+# through asyncio.to_thread
+def get_connection_row(connection_id: str) -> Optional[dict]:
+    """Load one saved connection as a dict, or None if it doesn't exist"""
+    cached = _connection_cache.get(connection_id)
+    if cached and cached[0] > time.monotonic():
+        return dict(cached[1])
+    
+    writes_seen = _connection_writes
+    with app_db() as conn:
+        row = conn.execute('SELECT * FROM connections WHERE id = ?', (connection_id,)).fetchone()
+    if not row:
+        return None
+    
+    connection = dict(row)
+    if writes_seen == _connection_writes:
+        _connection_cache[connection_id] = (time.monotonic() + CONNECTION_CACHE_TTL, connection)
+    return dict(connection)
+
+def list_connection_rows() -> List[dict]:
+    with app_db() as conn:
+        return [dict(row) for row in conn.execute('SELECT * FROM connections')]
+
+def execute_app_db(sql: str, params: tuple) -> None:
+    """Run one write against connections.db, rolling it back if it fails"""
+    global _connection_writes
+    with _app_db_writer_lock:
+        conn = _app_db_writer
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            # Bumped only once the write is visible, so any read that
+            # overlapped the commit sees a changed counter and isn't cached
+            _connection_writes += 1
+            _connection_cache.clear()
+
 # Initialize SQLite database
 def init_db():
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS connections (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            type TEXT NOT NULL,
-            host TEXT,
-            port INTEGER,
-            username TEXT,
-            password TEXT,
-            database TEXT,
-            connection_string TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    with app_db() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS connections (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                type TEXT NOT NULL,
+                host TEXT,
+                port INTEGER,
+                username TEXT,
+                password TEXT,
+                database TEXT,
+                connection_string TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
 
 init_db()
 
+# Blocking driver calls run on this pool via asyncio.to_thread; migrations
+# have their own pool (MIGRATION_THREADS) so they cannot starve it
+DB_WORKER_THREADS = int(os.environ.get("DB_WORKER_THREADS", "8"))
+
+@app.on_event("startup")
+async def configure_executor():
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=DB_WORKER_THREADS)
+    )
+
 def get_mssql_connection_string(connection: dict) -> str:
     """Helper function to build SQL Server connection string"""
     if connection['connection_string']:
@@ -67,31 +161,24 @@ def get_mssql_connection_string(connection: dict) -> str:
         f"PWD={connection['password']}"
     )
 
+def tables_response(tables: List[DatabaseTable]) -> ORJSONResponse:
+    """Encode a cached table list in one orjson call"""
+    return ORJSONResponse([table.model_dump() for table in tables])
+
 @app.get("/api/connections")
 async def get_connections():
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM connections')
-    rows = c.fetchall()
-    conn.close()
-    
-    connections = []
-    for row in rows:
-        connection = dict(zip([col[0] for col in c.description], row))
+    connections = await asyncio.to_thread(list_connection_rows)
+    for connection in connections:
         # Don't send password in response
         if 'password' in connection:
             connection['password'] = '****'
-        connections.append(connection)
     
     return connections
 
 @app.post("/api/connections")
 async def create_connection(connection: Connection):
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    
     try:
-        c.execute('''
+        await asyncio.to_thread(execute_app_db, '''
             INSERT INTO connections (id, name, type, host, port, username, password, 
                                    database, connection_string)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -106,43 +193,29 @@ async def create_connection(connection: Connection):
             connection.database,
             connection.connection_string
         ))
-        conn.commit()
     except sqlite3.Error as e:
-        conn.close()
         raise HTTPException(status_code=400, detail=str(e))
     
-    conn.close()
     return {"message": "Connection created successfully"}
 
 @app.get("/api/connections/{connection_id}/schema")
 async def get_schema(connection_id: str) -> List[DatabaseTable]:
     # Get connection details
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM connections WHERE id = ?', (connection_id,))
-    row = c.fetchone()
-    
-    if not row:
-        conn.close()
+    connection = await asyncio.to_thread(get_connection_row, connection_id)
+    if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
     
-    connection = dict(zip([col[0] for col in c.description], row))
-    conn.close()
-    
     try:
         if connection['type'] == 'mssql':
             conn_str = get_mssql_connection_string(connection)
-            return await fetch_mssql_schema(conn_str)
+            return tables_response(await fetch_mssql_schema(conn_str))
             
         elif connection['type'] == 'oracle':
-            conn_str = connection['connection_string']
-            if not conn_str:
-                conn_str = f"{connection['username']}/{connection['password']}@{connection['host']}:{connection['port']}/{connection['database']}"
-            # For Oracle, return empty list as we'll use search endpoint
+            # Oracle views are browsed through the search endpoint instead
             return []
             
         elif connection['type'] == 'sqlite':
-            return await fetch_sqlite_schema(connection['database'])
+            return tables_response(await fetch_sqlite_schema(connection['database']))
             
         else:
             raise HTTPException(status_code=400, detail="Unsupported database type")
@@ -161,29 +234,30 @@ async def get_schema(connection_id: str) -> List[DatabaseTable]:
 async def search_schema(connection_id: str, params: SearchParams) -> List[DatabaseTable]:
     logger.debug(f"Search request received with params: {params}")
     # Get connection details
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM connections WHERE id = ?', (connection_id,))
-    row = c.fetchone()
-    
-    if not row:
-        conn.close()
+    connection = await asyncio.to_thread(get_connection_row, connection_id)
+    if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
     
-    connection = dict(zip([col[0] for col in c.description], row))
-    conn.close()
+    if connection['type'] != 'oracle':
+        raise HTTPException(status_code=400, detail="Search is only supported for Oracle connections")
+    
+    if (params.after_schema is None) != (params.after_name is None):
+        raise HTTPException(status_code=400, detail="after_schema and after_name must be given together")
+    # A keyset page already starts after the previous one; an offset on top would skip rows
+    offset = 0 if params.after_schema is not None else params.offset
+    
+    conn_str = connection['connection_string']
+    if not conn_str:
+        conn_str = f"{connection['username']}/{connection['password']}@{connection['host']}:{connection['port']}/{connection['database']}"
     
     try:
-        if connection['type'] == 'oracle':
-            conn_str = connection['connection_string']
-            if not conn_str:
-                conn_str = f"{connection['username']}/{connection['password']}@{connection['host']}:{connection['port']}/{connection['database']}"
-                logger.debug("About to call search_oracle_views")
-                result = await search_oracle_views(conn_str, params.search, params.limit, params.offset)
-                logger.debug("search_oracle_views completed successfully")
-            return result
-        else:
-            raise HTTPException(status_code=400, detail="Search is only supported for Oracle connections")
+        logger.debug("About to call search_oracle_views")
+        result = await search_oracle_views(
+            conn_str, params.search, params.limit, offset,
+            params.exact_count, params.after_schema, params.after_name
+        )
+        logger.debug("search_oracle_views completed successfully")
+        return tables_response(result)
             
     except Exception as e:
         error_message = str(e)
@@ -198,11 +272,8 @@ async def search_schema(connection_id: str, params: SearchParams) -> List[Databa
 
 @app.put("/api/connections/{connection_id}")
 async def update_connection(connection_id: str, connection: Connection):
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    
     try:
-        c.execute('''
+        await asyncio.to_thread(execute_app_db, '''
             UPDATE connections 
             SET name=?, type=?, host=?, port=?, username=?, password=?, 
                 database=?, connection_string=?
@@ -218,77 +289,74 @@ async def update_connection(connection_id: str, connection: Connection):
             connection.connection_string,
             connection_id
         ))
-        conn.commit()
     except sqlite3.Error as e:
-        conn.close()
         raise HTTPException(status_code=400, detail=str(e))
     
-    conn.close()
+    invalidate_schema_cache()
     return {"message": "Connection updated successfully"}
 
 @app.delete("/api/connections/{connection_id}")
 async def delete_connection(connection_id: str):
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    
     try:
-        c.execute('DELETE FROM connections WHERE id = ?', (connection_id,))
-        conn.commit()
+        await asyncio.to_thread(execute_app_db, 'DELETE FROM connections WHERE id = ?', (connection_id,))
     except sqlite3.Error as e:
-        conn.close()
         raise HTTPException(status_code=400, detail=str(e))
     
-    conn.close()
+    invalidate_schema_cache()
     return {"message": "Connection deleted successfully"}
 
+def _test_connection_sync(connection: Connection) -> dict:
+    if connection.type == 'oracle':
+        conn_str = connection.connection_string
+        if not conn_str:
+            conn_str = f"{connection.username}/{connection.password}@{connection.host}:{connection.port}/{connection.database}"
+        
+        try:
+            # First try with simple connection string
+            conn = cx_Oracle.connect(conn_str)
+            conn.close()
+        except cx_Oracle.DatabaseError as e:
+            error_obj, = e.args
+            if error_obj.code == 12514:  # TNS:listener does not currently know of service requested
+                # Try with full connection descriptor
+                full_desc = (
+                    f"{connection.username}/{connection.password}@"
+                    f"(DESCRIPTION=(ADDRESS=(PROTOCOL=TCP)(HOST={connection.host})(PORT={connection.port}))"
+                    f"(CONNECT_DATA=(SERVICE_NAME={connection.database})))"
+                )
+                conn = cx_Oracle.connect(full_desc)
+                conn.close()
+            else:
+                raise
+        
+        return {"success": True, "message": "Connection successful"}
+        
+    elif connection.type == 'mssql':
+        conn_str = get_mssql_connection_string(dict(connection))
+        
+        conn = pyodbc.connect(conn_str, timeout=5)
+        cursor = conn.cursor()
+        cursor.execute('SELECT @@VERSION')
+        cursor.fetchone()
+        cursor.close()
+        conn.close()
+        
+        return {"success": True, "message": "Connection successful"}
+        
+    elif connection.type == 'sqlite':
+        conn = sqlite3.connect(connection.database)
+        conn.close()
+        return {"success": True, "message": "SQLite connection validated"}
+        
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported database type")
+
 @app.post("/api/connections/test")
 async def test_connection(connection: Connection):
     try:
-        if connection.type == 'oracle':
-            conn_str = connection.connection_string
-            if not conn_str:
-                conn_str = f"{connection.username}/{connection.password}@{connection.host}:{connection.port}/{connection.database}"
-            
-            try:
-                # First try with simple connection string
-                conn = cx_Oracle.connect(conn_str)
-                conn.close()
-            except cx_Oracle.DatabaseError as e:
-                error_obj, = e.args
-                if error_obj.code == 12514:  # TNS:listener does not currently know of service requested
-                    # Try with full connection descriptor
-                    full_desc = (
-                        f"{connection.username}/{connection.password}@"
-                        f"(DESCRIPTION=(ADDRESS=(PROTOCOL=TCP)(HOST={connection.host})(PORT={connection.port}))"
-                        f"(CONNECT_DATA=(SERVICE_NAME={connection.database})))"
-                    )
-                    conn = cx_Oracle.connect(full_desc)
-                    conn.close()
-                else:
-                    raise
-            
-            return {"success": True, "message": "Connection successful"}
-            
-        elif connection.type == 'mssql':
-            conn_str = get_mssql_connection_string(dict(connection))
-            
-            conn = pyodbc.connect(conn_str, timeout=5)
-            cursor = conn.cursor()
-            cursor.execute('SELECT @@VERSION')
-            cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            return {"success": True, "message": "Connection successful"}
-            
-        elif connection.type == 'sqlite':
-            conn = sqlite3.connect(connection.database)
-            conn.close()
-            return {"success": True, "message": "SQLite connection validated"}
-            
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported database type")
-            
+        # Driver connects block for seconds on a bad host; keep them off the event loop
+        return await asyncio.to_thread(_test_connection_sync, connection)
+    
     except Exception as e:
         error_message = str(e)
         if "ORA-12514" in error_message:
@@ -302,45 +370,53 @@ async def test_connection(connection: Connection):
 @app.post("/api/migration/start")
 async def start_migration(request: MigrationRequest):
     # Get source and destination connections
-    conn = sqlite3.connect('connections.db')
-    c = conn.cursor()
-    
-    # Get source connection
-    c.execute('SELECT * FROM connections WHERE id = ?', (request.source_connection_id,))
-    source_row = c.fetchone()
-    if not source_row:
-        conn.close()
+    source_conn = await asyncio.to_thread(get_connection_row, request.source_connection_id)
+    if not source_conn:
         raise HTTPException(status_code=404, detail="Source connection not found")
-    source_conn = dict(zip([col[0] for col in c.description], source_row))
     
-    # Get destination connection
-    c.execute('SELECT * FROM connections WHERE id = ?', (request.destination_connection_id,))
-    dest_row = c.fetchone()
-    if not dest_row:
-        conn.close()
+    dest_conn = await asyncio.to_thread(get_connection_row, request.destination_connection_id)
+    if not dest_conn:
         raise HTTPException(status_code=404, detail="Destination connection not found")
-    dest_conn = dict(zip([col[0] for col in c.description], dest_row))
     
-    conn.close()
+    # The pipeline reads with cx_Oracle and writes with pyodbc; dispatch on
+    # the saved connection type, never on what the connection string contains
+    if source_conn['type'] != 'oracle' or dest_conn['type'] != 'mssql':
+        raise HTTPException(status_code=400, detail="Migration is only supported from Oracle to SQL Server")
     
     try:
         # Extract chunks from source
         source_conn_str = source_conn['connection_string'] or f"{source_conn['username']}/{source_conn['password']}@{source_conn['host']}:{source_conn['port']}/{source_conn['database']}"
         dest_conn_str = get_mssql_connection_string(dest_conn)
         
-        chunks_processed = 0
-        async for chunk in extract_table_chunks(
+        if not request.stage_chunks:
+            chunks_processed, rows_migrated = await stream_table(
+                source_conn_str,
+                dest_conn_str,
+                request.table_name,
+                request.schema,
+                request.selected_columns
+            )
+            return {
+                "message": "Migration completed successfully",
+                # Commit batches of STREAM_COMMIT_ROWS; chunk_size only applies to staging
+                "chunks_processed": chunks_processed,
+                "rows_migrated": rows_migrated
+            }
+        
+        chunks_processed, rows_migrated = await migrate_staged(
             source_conn_str,
+            dest_conn_str,
             request.table_name,
             request.schema,
             request.chunk_size,
             request.selected_columns
-        ):
-            # Import chunk to destination
-            await import_chunk(dest_conn_str, chunk, create_table=(chunks_processed == 0))
-            chunks_processed += 1
+        )
         
-        return {"message": "Migration completed successfully", "chunks_processed": chunks_processed}
+        return {
+            "message": "Migration completed successfully",
+            "chunks_processed": chunks_processed,
+            "rows_migrated": rows_migrated
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
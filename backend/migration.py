@@ -1,22 +1,126 @@
+import asyncio
+import atexit
 import csv
+import functools
+import gzip
+import io
 import os
+import queue
+import re
+import shutil
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from tempfile import mkdtemp
-from typing import AsyncGenerator, List, Optional, Dict, Any
+from typing import AsyncGenerator, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple
 import sqlite3
 import pyodbc
 import cx_Oracle
-from models import MigrationChunk
+from pool import get_oracle_pool, init_oracle_client, mssql_connection, oracle_connection
+from sqlnames import oracle_table_identifier, quote_mssql, quote_oracle
 
-TEMP_DIR = mkdtemp()
-CHUNK_SIZE = 1000000  # Process 1M rows at a time
+try:
+    # Optional: compresses chunk files several times faster than gzip
+    import zstandard
+except ImportError:
+    zstandard = None
 
-# Initialize Oracle client once at module level
-os.environ["NLS_LANG"] = ".AL32UTF8"
 try:
-    cx_Oracle.init_oracle_client()
-except Exception as e:
-    if "Oracle Client library has already been initialized" not in str(e):
-        raise
+    # Optional: the fastest chunk codec, at a lower compression ratio than zstd
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+try:
+    # Optional: typed, columnar Parquet chunk files
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+TEMP_DIR = mkdtemp()
+# Chunks left behind by failed or interrupted migrations go with the process
+atexit.register(shutil.rmtree, TEMP_DIR, ignore_errors=True)
+CHUNK_SIZE = 131072  # Rows per staged chunk file
+FETCH_BATCH_SIZE = 50000  # Rows pulled per fetchmany round-trip
+IMPORT_BATCH_SIZE = 10000  # Rows sent per executemany call
+STREAM_COMMIT_ROWS = 500000  # Rows per transaction when streaming without chunk files
+PREFETCH_DEPTH = 2  # Fetched batches allowed to wait for the CSV writer
+STAGED_CHUNKS_AHEAD = 2  # Extracted chunk files allowed to wait for the importer
+CSV_BUFFER_SIZE = 4 * 1024 * 1024  # Bytes buffered per chunk file read or write
+# Load chunk files with BULK INSERT; only when the SQL Server instance can
+# read TEMP_DIR at the same path (same host or a shared mount)
+MSSQL_BULK_INSERT = os.environ.get("MSSQL_BULK_INSERT", "").lower() in ("1", "true", "yes", "on")
+# Chunks extracted at once, each on its own pooled session, when the table
+# has a single-column primary key to split on
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", "4"))
+# Staged chunks loaded at once, each on its own pooled SQL Server connection
+IMPORT_WORKERS = int(os.environ.get("IMPORT_WORKERS", "4"))
+# Threads for blocking migration work. A migration holds its threads for
+# minutes, so they come from this pool, not the default executor the
+# API's own to_thread calls share
+MIGRATION_THREADS = int(os.environ.get("MIGRATION_THREADS", "32"))
+# Chunk file compression: zstd, lz4, gzip or none. BULK INSERT needs plain CSV
+# the server can read, so it defaults to none there
+CHUNK_COMPRESSION = os.environ.get(
+    "CHUNK_COMPRESSION", "none" if MSSQL_BULK_INSERT else "zstd"
+).lower()
+if (CHUNK_COMPRESSION == "zstd" and zstandard is None) or (CHUNK_COMPRESSION == "lz4" and lz4 is None):
+    CHUNK_COMPRESSION = "gzip"
+_CHUNK_SUFFIXES = {"zstd": ".csv.zst", "lz4": ".csv.lz4", "gzip": ".csv.gz"}
+# Chunk file format: parquet (when pyarrow is installed) keeps column types
+# and compresses per column; csv is what BULK INSERT reads
+CHUNK_FORMAT = os.environ.get(
+    "CHUNK_FORMAT", "csv" if MSSQL_BULK_INSERT else "parquet"
+).lower()
+if CHUNK_FORMAT == "parquet" and pyarrow is None:
+    CHUNK_FORMAT = "csv"
+
+# Binary columns come back as bytes and are written to CSV as text
+_BINARY_TYPES = (cx_Oracle.DB_TYPE_RAW, cx_Oracle.DB_TYPE_LONG_RAW, cx_Oracle.DB_TYPE_BLOB)
+
+# Optimizer statistics; NULL for views and tables never analyzed
+_TABLE_NUM_ROWS_SQL = """
+    SELECT num_rows
+    FROM all_tables
+    WHERE owner = NVL(:owner, USER)
+    AND table_name = :table_name
+"""
+
+_PRIMARY_KEY_SQL = """
+    SELECT cc.column_name
+    FROM all_constraints c
+    INNER JOIN all_cons_columns cc ON cc.owner = c.owner AND cc.constraint_name = c.constraint_name
+    WHERE c.constraint_type = 'P'
+    AND c.owner = NVL(:owner, USER)
+    AND c.table_name = :table_name
+"""
+
+# One (low, high) key pair per chunk, each range holding ~chunk_size rows
+# Any session can read this; unlike V$DATABASE it needs no grants
+_CURRENT_SCN_SQL = "SELECT TIMESTAMP_TO_SCN(SYSTIMESTAMP) FROM DUAL"
+
+_KEY_RANGES_SQL = """
+    SELECT MIN(key_value), MAX(key_value)
+    FROM (
+        SELECT {key} AS key_value, NTILE(:buckets) OVER (ORDER BY {key}) AS bucket
+        FROM {table}
+    )
+    GROUP BY bucket
+    ORDER BY bucket
+"""
+
+init_oracle_client()
+
+_migration_executor = ThreadPoolExecutor(max_workers=MIGRATION_THREADS, thread_name_prefix="migration")
+
+def _in_migration_thread(func, *args, **kwargs) -> asyncio.Future:
+    """Run a blocking call on the migration pool, like asyncio.to_thread"""
+    return asyncio.get_running_loop().run_in_executor(
+        _migration_executor, functools.partial(func, *args, **kwargs)
+    )
 
 async def extract_table_chunks(
     connection_string: str,
@@ -25,181 +129,288 @@ async def extract_table_chunks(
     chunk_size: int = CHUNK_SIZE,
     selected_columns: List[str] = None
 ) -> AsyncGenerator[Dict[str, Any], None]:
+    pool = None
     conn = None
     cursor = None
+    table_temp_dir = None
+    completed = False
+    # Every Oracle call runs on this one thread, off the event loop, so the
+    # cursor is never shared
+    fetcher = ThreadPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+    
+    def on_fetcher(func, *args):
+        return loop.run_in_executor(fetcher, func, *args)
     
     try:
-        # Connect to Oracle source database
-        conn = cx_Oracle.connect(connection_string)
-        cursor = conn.cursor()
-        
-        # Configure session for large data
-        cursor.execute("ALTER SESSION SET NLS_LENGTH_SEMANTICS = 'CHAR'")
-        cursor.execute("ALTER SESSION SET NLS_DATE_FORMAT = 'YYYY-MM-DD HH24:MI:SS'")
-        cursor.arraysize = 1000  # Fetch 1000 rows at a time
+        # Pooled sessions already carry the NLS settings for large data
+        pool = await on_fetcher(get_oracle_pool, connection_string)
+        conn = await on_fetcher(pool.acquire)
+        cursor = _bulk_fetch_cursor(conn)
         
         # Get column information
-        columns = selected_columns if selected_columns else get_table_columns(cursor, table_name, schema)
-        columns_str = ', '.join([f'"{col}"' for col in columns])
-        table_identifier = f"{schema}.{table_name}" if schema else table_name
+        columns = selected_columns if selected_columns else await on_fetcher(get_table_columns, cursor, table_name, schema)
+        columns_str = ', '.join([quote_oracle(col) for col in columns])
+        table_identifier = oracle_table_identifier(table_name, schema)
+        
+        # Describe the selected columns so the destination table can be typed
+        await on_fetcher(cursor.execute, f"SELECT {columns_str} FROM {table_identifier} WHERE 1=0")
+        column_types = [_staged_column_type(desc) for desc in cursor.description]
         
-        # Create temp directory for this table
-        table_temp_dir = os.path.join(TEMP_DIR, table_name)
-        os.makedirs(table_temp_dir, exist_ok=True)
+        # A fresh directory per extraction, so concurrent runs of the same
+        # table never share files and odd table names can't escape TEMP_DIR
+        table_temp_dir = mkdtemp(prefix=f"{re.sub(r'[^A-Za-z0-9_]', '_', table_name)}_", dir=TEMP_DIR)
         
         print(f"Starting extraction for {table_name}")
         print(f"Temp directory: {table_temp_dir}")
         
-        # Get total row count first
-        cursor.execute(f"SELECT COUNT(*) FROM {table_identifier}")
-        total_rows = cursor.fetchone()[0]
-        total_chunks = (total_rows + chunk_size - 1) // chunk_size
+        # Only sizes the key ranges and labels chunks, so an estimate will do;
+        # without statistics the total is unknown (-1) and chunks are numbered
+        # as they are written
+        total_rows = await on_fetcher(get_estimated_row_count, cursor, table_name, schema)
+        total_chunks = -1 if total_rows is None else (total_rows + chunk_size - 1) // chunk_size
         
-        # Extract data in chunks
-        offset = 0
-        chunk_num = 0
+        def chunk_info(chunk_num: int, chunk_file: str) -> Dict[str, Any]:
+            return {
+                'file': chunk_file,
+                'chunk_number': chunk_num,
+                'total_chunks': total_chunks,
+                'columns': columns,
+                'column_types': column_types,
+                'table_name': table_name,
+                'schema': schema,
+                'total_rows': total_rows
+            }
+        
+        # Only tables have a primary key, so views always take the single query below
+        key_column = None
+        if EXTRACT_WORKERS > 1 and total_chunks > 1:
+            key_column = await on_fetcher(get_primary_key_column, cursor, table_name, schema)
         
-        while offset < total_rows:
-            # Use ROWNUM for pagination instead of bind variables
-            query = f"""
-                SELECT {columns_str}
-                FROM (
-                    SELECT a.*, ROWNUM rnum
-                    FROM (
-                        SELECT {columns_str}
-                        FROM {table_identifier}
-                        ORDER BY 1
-                    ) a
-                    WHERE ROWNUM <= {offset + chunk_size}
+        key_ranges = None
+        if key_column:
+            # The ranges run on separate sessions, so all of them (and the
+            # bucketing) read as of one SCN to stay one consistent snapshot
+            key = quote_oracle(key_column)
+            snapshot = f"{table_identifier} AS OF SCN :scn"
+            try:
+                await on_fetcher(cursor.execute, _CURRENT_SCN_SQL)
+                (scn,) = await on_fetcher(cursor.fetchone)
+                await on_fetcher(
+                    cursor.execute, _KEY_RANGES_SQL.format(key=key, table=snapshot),
+                    {'buckets': total_chunks, 'scn': scn}
                 )
-                WHERE rnum > {offset}
-            """
+                key_ranges = await on_fetcher(cursor.fetchall)
+            except cx_Oracle.DatabaseError as e:
+                # Flashback queries on another schema's table need the FLASHBACK privilege
+                print(f"Extracting {table_name} with one query, no snapshot for key ranges: {str(e)}")
+        
+        if key_ranges:
+            # Disjoint key ranges are independent, so several are extracted at
+            # once; only EXTRACT_WORKERS chunks run ahead of the importer
+            query = f"SELECT {columns_str} FROM {snapshot} WHERE {key} BETWEEN :low AND :high"
             
-            cursor.execute(query)
+            async def finish(chunk_num: int, chunk_file: str, future) -> Dict[str, Any]:
+                row_count = await asyncio.wrap_future(future)
+                print(f"Saved chunk {chunk_num} with {row_count} rows")
+                return chunk_info(chunk_num, chunk_file)
             
-            rows = []
-            while True:
-                row = cursor.fetchone()
-                if not row:
-                    break
-                
-                # Convert row data to strings, handling None values and LOBs
-                row_data = []
-                for val in row:
-                    if val is None:
-                        row_data.append('')
-                    elif isinstance(val, cx_Oracle.LOB):
-                        row_data.append(val.read())
-                    elif isinstance(val, (bytes, bytearray)):
-                        row_data.append(val.decode('utf-8', errors='replace'))
-                    else:
-                        row_data.append(str(val))
-                
-                rows.append(row_data)
+            workers = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS)
+            try:
+                pending = deque()
+                for chunk_num, (low, high) in enumerate(key_ranges):
+                    chunk_file = chunk_file_path(table_temp_dir, chunk_num)
+                    pending.append((chunk_num, chunk_file, workers.submit(
+                        _extract_key_range, connection_string, query, scn, low, high, chunk_file, columns
+                    )))
+                    if len(pending) >= EXTRACT_WORKERS:
+                        yield await finish(*pending.popleft())
+                while pending:
+                    yield await finish(*pending.popleft())
+            finally:
+                # Ranges already running finish off the event loop; queued ones never start
+                await _in_migration_thread(workers.shutdown, cancel_futures=True)
+            completed = True
+            return
+        
+        # One query streams the whole table; chunks are cut from the cursor
+        # rather than re-sorting and skipping rows for every page
+        await on_fetcher(cursor.execute, f"SELECT {columns_str} FROM {table_identifier}")
+        
+        chunk_num = 0
+        while True:
+            chunk_file = chunk_file_path(table_temp_dir, chunk_num)
+            row_count = await _in_migration_thread(
+                save_chunk, chunk_file, columns, cursor.description,
+                _prefetch(_iter_csv_batches(cursor, chunk_size), fetcher)
+            )
             
-            if rows:
-                chunk_file = os.path.join(table_temp_dir, f"chunk_{chunk_num}.csv")
-                chunk_data = [dict(zip(columns, row_data)) for row_data in rows]
-                save_chunk_to_csv(chunk_file, columns, chunk_data)
-                print(f"Saved chunk {chunk_num} with {len(rows)} rows")
-                
-                yield {
-                    'file': chunk_file,
-                    'chunk_number': chunk_num,
-                    'total_chunks': total_chunks,
-                    'columns': columns,
-                    'table_name': table_name,
-                    'schema': schema,
-                    'total_rows': total_rows
-                }
-                
-                chunk_num += 1
+            if not row_count:
+                os.remove(chunk_file)
+                completed = True
+                break
             
-            offset += chunk_size
+            print(f"Saved chunk {chunk_num} with {row_count} rows")
+            yield chunk_info(chunk_num, chunk_file)
+            chunk_num += 1
             
     except Exception as e:
         print(f"Error during extraction: {str(e)}")
         raise Exception(f"Error extracting data: {str(e)}")
         
     finally:
+        # An in-flight fetch may still hold the cursor, so wait for it off
+        # the event loop before closing the cursor and releasing the session.
+        # Queued work isn't cancelled: a chunk writer may be waiting on it
+        await _in_migration_thread(fetcher.shutdown)
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
+            pool.release(conn)
+        # Extraction failed or the consumer stopped early: none of these chunks
+        # will be imported. After a full run the consumer still owns them
+        if table_temp_dir and not completed:
+            shutil.rmtree(table_temp_dir, ignore_errors=True)
+
+async def migrate_staged(
+    source_connection_string: str,
+    dest_connection_string: str,
+    table_name: str,
+    schema: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    selected_columns: List[str] = None
+) -> Tuple[int, int]:
+    """Extract chunk files and import them concurrently; returns (chunks, rows) migrated"""
+    chunks = asyncio.Queue(maxsize=STAGED_CHUNKS_AHEAD)
+    
+    async def extract():
+        try:
+            async for chunk in extract_table_chunks(
+                source_connection_string, table_name, schema, chunk_size, selected_columns
+            ):
+                await chunks.put(chunk)
+        except Exception as e:
+            await chunks.put(e)
+            return
+        await chunks.put(None)
+    
+    # The next chunks are extracted while earlier ones are imported
+    extractor = asyncio.create_task(extract())
+    importing = set()
+    stop_imports = threading.Event()
+    chunks_seen = 0
+    rows_migrated = 0
+    staging_dir = None
+    
+    async def collect(return_when: str) -> int:
+        done, _ = await asyncio.wait(importing, return_when=return_when)
+        importing.difference_update(done)
+        return sum(task.result() for task in done)  # Re-raises a failed import
+    
+    try:
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            
+            staging_dir = os.path.dirname(chunk['file'])
+            if chunks_seen == 0:
+                # The first chunk brings the source column types
+                await init_destination_table(
+                    dest_connection_string, chunk['table_name'], list(zip(chunk['columns'], chunk['column_types']))
+                )
+            
+            # Chunks are independent row sets, so several load side by side
+            importing.add(asyncio.create_task(import_chunk(dest_connection_string, chunk, stop_imports)))
+            chunks_seen += 1
+            # Reap finished loads right away so a failure stops the run early
+            if len(importing) >= IMPORT_WORKERS or any(task.done() for task in importing):
+                rows_migrated += await collect(asyncio.FIRST_COMPLETED)
+        
+        if importing:
+            rows_migrated += await collect(asyncio.ALL_COMPLETED)
+    finally:
+        # Stops extraction after a failed import; the generator removes its files
+        extractor.cancel()
+        # Import threads can't be cancelled: each sees the flag between
+        # batches and rolls its chunk back. Wait for them and the extractor
+        # so nothing still reads the staging directory once it is removed
+        stop_imports.set()
+        await asyncio.gather(extractor, *importing, return_exceptions=True)
+        # Chunks still queued behind a failed import are never loaded
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    return chunks_seen, rows_migrated
+
+async def init_destination_table(
+    connection_string: str,
+    table_name: str,
+    column_defs: List[Tuple[str, str]]
+) -> None:
+    """Create the destination table once, before any chunk is imported"""
+    await _in_migration_thread(_init_destination_table_sync, connection_string, table_name, column_defs)
+
+def _init_destination_table_sync(
+    connection_string: str,
+    table_name: str,
+    column_defs: List[Tuple[str, str]]
+) -> None:
+    try:
+        with mssql_connection(connection_string) as conn:
+            cursor = conn.cursor()
+            create_table_if_missing(cursor, table_name, column_defs)
+            conn.commit()
+            cursor.close()
+    except Exception as e:
+        raise Exception(f"Error creating destination table: {str(e)}")
 
 async def import_chunk(
     connection_string: str,
     chunk_info: Dict[str, Any],
-    create_table: bool = False
+    stop: Optional[threading.Event] = None
+) -> int:
+    """Load one chunk file; setting `stop` abandons the load and rolls it back"""
+    return await _in_migration_thread(_import_chunk_sync, connection_string, chunk_info, stop)
+
+def _check_stop(stop: Optional[threading.Event]) -> None:
+    if stop is not None and stop.is_set():
+        raise Exception("Import cancelled")
+
+def _import_chunk_sync(
+    connection_string: str,
+    chunk_info: Dict[str, Any],
+    stop: Optional[threading.Event] = None
 ) -> int:
-    conn = None
-    cursor = None
-    rows_imported = 0
-    
     try:
-        # Connect to SQL Server with fast load enabled
-        conn = pyodbc.connect(connection_string, autocommit=False)
-        cursor = conn.cursor()
-        
-        table_name = chunk_info['table_name']
-        chunk_file = chunk_info['file']
-        
-        # Create table if needed (only for first chunk)
-        if create_table:
-            # Check if table exists first
-            cursor.execute(f"""
-                IF NOT EXISTS (SELECT * FROM sys.objects 
-                WHERE object_id = OBJECT_ID(N'{table_name}') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE {table_name} (
-                        {', '.join([f'[{col}] NVARCHAR(MAX)' for col in chunk_info['columns']])}
-                    )
-                END
-            """)
-            conn.commit()
-        
-        # Import data from CSV using fast load
-        print(f"Importing data from {chunk_file}")
-        with open(chunk_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            batch = []
+        # Pooled connections come back rolled back; a failed one is closed instead
+        with mssql_connection(connection_string) as conn:
+            cursor = _bulk_insert_cursor(conn)
             
-            for row in reader:
-                # Handle empty strings as NULL
-                row_values = [
-                    None if val == '' else val 
-                    for val in [row[col] for col in chunk_info['columns']]
-                ]
-                
-                batch.append(row_values)
-                rows_imported += 1
-                
-                # Execute in larger batches for better performance
-                if len(batch) >= 10000:  # Increased batch size
-                    columns_str = ','.join([f'[{col}]' for col in chunk_info['columns']])
-                    placeholders = ','.join(['?' for _ in chunk_info['columns']])
-                    query = f"""
-                        INSERT INTO {table_name} ({columns_str})
-                        VALUES ({placeholders})
-                    """
-                    cursor.fast_executemany = True  # Enable fast load
-                    cursor.executemany(query, batch)
-                    print(f"Imported {rows_imported} rows")
-                    batch = []
-                    conn.commit()  # Commit each batch
+            table_name = chunk_info['table_name']
+            chunk_file = chunk_info['file']
             
-            # Import remaining rows
-            if batch:
-                columns_str = ','.join([f'[{col}]' for col in chunk_info['columns']])
-                placeholders = ','.join(['?' for _ in chunk_info['columns']])
-                query = f"""
-                    INSERT INTO {table_name} ({columns_str})
-                    VALUES ({placeholders})
-                """
-                cursor.fast_executemany = True  # Enable fast load
-                cursor.executemany(query, batch)
-                print(f"Imported final {len(batch)} rows")
-                conn.commit()
+            _check_stop(stop)
+            print(f"Importing data from {chunk_file}")
+            rows_imported = None
+            if MSSQL_BULK_INSERT and chunk_file.endswith('.csv'):
+                try:
+                    rows_imported = _bulk_insert_csv(cursor, table_name, chunk_file)
+                    conn.commit()
+                except pyodbc.Error as e:
+                    # Typically a missing bulk-load permission or a file the server can't see
+                    conn.rollback()
+                    print(f"BULK INSERT failed, falling back to batched inserts: {str(e)}")
+                    rows_imported = None
+            
+            if rows_imported is None and chunk_file.endswith('.parquet'):
+                rows_imported = _insert_parquet_rows(conn, cursor, table_name, chunk_file, stop)
+            elif rows_imported is None:
+                rows_imported = _insert_csv_rows(conn, cursor, table_name, chunk_file, stop)
+            
+            cursor.close()
         
         print(f"Successfully imported {rows_imported} rows")
         
@@ -211,39 +422,415 @@ async def import_chunk(
         
     except Exception as e:
         print(f"Error during import: {str(e)}")
-        if conn:
-            try:
-                conn.rollback()
-            except:
-                pass  # Ignore rollback errors
         raise Exception(f"Error importing data: {str(e)}")
+
+def _bulk_insert_csv(cursor, table_name: str, chunk_file: str) -> int:
+    """Load a chunk file with SQL Server's own bulk loader; the server reads the file itself"""
+    server_path = chunk_file.replace("'", "''")
+    # NOCOUNT hides the row count from cursor.rowcount, so ask for it
+    cursor.execute(f"""
+        BULK INSERT {quote_mssql(table_name)}
+        FROM '{server_path}'
+        WITH (FORMAT = 'CSV', FIRSTROW = 2, CODEPAGE = '65001', KEEPNULLS, TABLOCK);
+        SELECT @@ROWCOUNT;
+    """)
+    return cursor.fetchone()[0]
+
+def _insert_csv_rows(conn, cursor, table_name: str, chunk_file: str, stop: Optional[threading.Event] = None) -> int:
+    """Insert a chunk file through batched fast_executemany calls in one transaction"""
+    rows_imported = 0
+    with open_chunk_file(chunk_file, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return 0
         
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
-        if conn:
+        # Built once per chunk from the file's own header
+        query = mssql_insert_sql(table_name, header)
+        
+        while True:
+            # Every CSV field is a string, so `or None` turns empty fields into NULL
+            batch = [[val or None for val in row] for row in islice(reader, IMPORT_BATCH_SIZE)]
+            if not batch:
+                break
+            
+            _check_stop(stop)
+            cursor.executemany(query, batch)
+            rows_imported += len(batch)
+            print(f"Imported {rows_imported} rows")
+    
+    # One commit per chunk: one log flush, and a failed chunk leaves no rows
+    conn.commit()
+    return rows_imported
+
+async def stream_table(
+    source_connection_string: str,
+    dest_connection_string: str,
+    table_name: str,
+    schema: Optional[str] = None,
+    selected_columns: List[str] = None
+) -> Tuple[int, int]:
+    """Copy a table straight from the Oracle cursor into SQL Server, without staging files;
+    returns (commits, rows) migrated"""
+    return await _in_migration_thread(
+        _stream_table_sync, source_connection_string, dest_connection_string, table_name, schema, selected_columns
+    )
+
+def _stream_table_sync(
+    source_connection_string: str,
+    dest_connection_string: str,
+    table_name: str,
+    schema: Optional[str],
+    selected_columns: Optional[List[str]]
+) -> Tuple[int, int]:
+    rows_imported = 0
+    commits = 0
+    fetcher = ThreadPoolExecutor(max_workers=1)
+    
+    try:
+        with oracle_connection(source_connection_string) as src_conn, \
+                mssql_connection(dest_connection_string) as dest_conn:
+            src_cursor = _bulk_fetch_cursor(src_conn)
+            dest_cursor = _bulk_insert_cursor(dest_conn)
             try:
-                conn.close()
-            except:
-                pass
+                columns = selected_columns if selected_columns else get_table_columns(src_cursor, table_name, schema)
+                columns_str = ', '.join([quote_oracle(col) for col in columns])
+                table_identifier = oracle_table_identifier(table_name, schema)
+                
+                # One pass over the table: no pagination, no ORDER BY
+                src_cursor.execute(f"SELECT {columns_str} FROM {table_identifier}")
+                
+                # Values arrive with their native types, so the table can keep them too
+                create_table_if_missing(dest_cursor, table_name, [
+                    (col, _mssql_column_type(desc)) for col, desc in zip(columns, src_cursor.description)
+                ])
+                dest_conn.commit()
+                
+                query = mssql_insert_sql(table_name, columns)
+                
+                # The next batch is fetched from Oracle while this one is inserted
+                batches = iter(lambda: src_cursor.fetchmany(src_cursor.arraysize), [])
+                uncommitted = 0
+                for batch in _prefetch(batches, fetcher):
+                    dest_cursor.executemany(query, batch)
+                    rows_imported += len(batch)
+                    uncommitted += len(batch)
+                    if uncommitted >= STREAM_COMMIT_ROWS:
+                        dest_conn.commit()
+                        commits += 1
+                        uncommitted = 0
+                    print(f"Streamed {rows_imported} rows")
+                dest_conn.commit()
+                if uncommitted:
+                    commits += 1
+            finally:
+                src_cursor.close()
+                dest_cursor.close()
+        
+        return commits, rows_imported
+        
+    except Exception as e:
+        print(f"Error during streaming migration: {str(e)}")
+        raise Exception(f"Error migrating data: {str(e)}")
+        
+    finally:
+        fetcher.shutdown()
+
+def _insert_parquet_rows(conn, cursor, table_name: str, chunk_file: str, stop: Optional[threading.Event] = None) -> int:
+    """Insert a Parquet chunk through batched fast_executemany calls in one transaction"""
+    rows_imported = 0
+    parquet_file = pyarrow.parquet.ParquetFile(chunk_file)
+    query = mssql_insert_sql(table_name, parquet_file.schema_arrow.names)
+    
+    for record_batch in parquet_file.iter_batches(batch_size=IMPORT_BATCH_SIZE):
+        # Values come back typed (int, Decimal, datetime), so nothing is re-parsed
+        batch = list(zip(*[column.to_pylist() for column in record_batch.columns]))
+        _check_stop(stop)
+        cursor.executemany(query, batch)
+        rows_imported += len(batch)
+        print(f"Imported {rows_imported} rows")
+    
+    conn.commit()
+    return rows_imported
+
+def _arrow_type(desc: Sequence[Any]):
+    """Map an Oracle cursor.description entry to the Arrow type of its fetched values"""
+    _, type_, _, _, precision, scale, _ = desc
+    if type_ == cx_Oracle.DB_TYPE_NUMBER:
+        if precision and scale == 0:
+            return pyarrow.int64() if precision <= 18 else pyarrow.decimal128(precision, 0)
+        # NUMBER(p, s) is fetched as Decimal, matching the DECIMAL destination column
+        if _is_exact_decimal(precision, scale):
+            return pyarrow.decimal128(precision, scale)
+        return pyarrow.float64()  # Unconstrained NUMBER and FLOAT, up to about 1E125
+    if type_ in (cx_Oracle.DB_TYPE_BINARY_DOUBLE, cx_Oracle.DB_TYPE_BINARY_FLOAT):
+        return pyarrow.float64()
+    if type_ in (cx_Oracle.DB_TYPE_DATE, cx_Oracle.DB_TYPE_TIMESTAMP,
+                 cx_Oracle.DB_TYPE_TIMESTAMP_TZ, cx_Oracle.DB_TYPE_TIMESTAMP_LTZ):
+        return pyarrow.timestamp('us')
+    return pyarrow.string()  # Binary columns are already decoded to text; the rest via str()
+
+def _is_exact_decimal(precision: int, scale: int) -> bool:
+    """Whether a NUMBER's declared precision and scale fit a DECIMAL column"""
+    return bool(precision and scale and 0 < scale <= precision)
+
+def _mssql_column_type(desc: Sequence[Any]) -> str:
+    """Map an Oracle cursor.description entry to a SQL Server column type"""
+    _, type_, display_size, _, precision, scale, _ = desc
+    if type_ == cx_Oracle.DB_TYPE_NUMBER:
+        if precision and scale == 0:
+            return 'BIGINT' if precision <= 18 else f'DECIMAL({precision}, 0)'
+        if _is_exact_decimal(precision, scale):
+            return f'DECIMAL({precision}, {scale})'
+        return 'FLOAT'  # Unconstrained NUMBER and FLOAT(b) overflow any DECIMAL
+    if type_ == cx_Oracle.DB_TYPE_BINARY_DOUBLE:
+        return 'FLOAT'
+    if type_ == cx_Oracle.DB_TYPE_BINARY_FLOAT:
+        return 'REAL'
+    if type_ in (cx_Oracle.DB_TYPE_DATE, cx_Oracle.DB_TYPE_TIMESTAMP,
+                 cx_Oracle.DB_TYPE_TIMESTAMP_TZ, cx_Oracle.DB_TYPE_TIMESTAMP_LTZ):
+        return 'DATETIME2'
+    if type_ in (cx_Oracle.DB_TYPE_VARCHAR, cx_Oracle.DB_TYPE_NVARCHAR,
+                 cx_Oracle.DB_TYPE_CHAR, cx_Oracle.DB_TYPE_NCHAR):
+        return f'NVARCHAR({display_size})' if display_size and display_size <= 4000 else 'NVARCHAR(MAX)'
+    if type_ in _BINARY_TYPES:
+        return 'VARBINARY(MAX)'
+    return 'NVARCHAR(MAX)'
+
+def _staged_column_type(desc: Sequence[Any]) -> str:
+    """SQL Server type for a column loaded from a chunk file, where binary values are already text"""
+    if desc[1] in _BINARY_TYPES:
+        return 'NVARCHAR(MAX)'
+    return _mssql_column_type(desc)
+
+def create_table_if_missing(cursor, table_name: str, column_defs: List[Tuple[str, str]]) -> None:
+    """Create the destination table from (column, SQL Server type) pairs unless it exists"""
+    quoted_table = quote_mssql(table_name)
+    cursor.execute(f"""
+        IF NOT EXISTS (SELECT * FROM sys.objects 
+        WHERE object_id = OBJECT_ID(?) AND type in (N'U'))
+        BEGIN
+            CREATE TABLE {quoted_table} (
+                {', '.join([f'{quote_mssql(col)} {col_type}' for col, col_type in column_defs])}
+            )
+        END
+    """, quoted_table)
+
+def _extract_key_range(
+    connection_string: str,
+    query: str,
+    scn: int,
+    low: Any,
+    high: Any,
+    chunk_file: str,
+    columns: List[str]
+) -> int:
+    """Write one primary-key range, as of the given SCN, to a chunk file on its own pooled session"""
+    with oracle_connection(connection_string) as conn:
+        cursor = _bulk_fetch_cursor(conn)
+        try:
+            cursor.execute(query, scn=scn, low=low, high=high)
+            return save_chunk(chunk_file, columns, cursor.description, _iter_csv_batches(cursor))
+        finally:
+            cursor.close()
+
+def get_estimated_row_count(cursor, table_name: str, schema: Optional[str] = None) -> Optional[int]:
+    """Row count from optimizer statistics, or None when there are none"""
+    cursor.execute(_TABLE_NUM_ROWS_SQL, owner=schema, table_name=table_name)
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def get_primary_key_column(cursor, table_name: str, schema: Optional[str] = None) -> Optional[str]:
+    """Get the table's primary key column, or None unless it is a single column"""
+    cursor.execute(_PRIMARY_KEY_SQL, owner=schema, table_name=table_name)
+    key_columns = cursor.fetchall()
+    return key_columns[0][0] if len(key_columns) == 1 else None
+
+def mssql_insert_sql(table_name: str, columns: List[str]) -> str:
+    columns_str = ','.join([quote_mssql(col) for col in columns])
+    placeholders = ','.join(['?' for _ in columns])
+    return f"INSERT INTO {quote_mssql(table_name)} ({columns_str}) VALUES ({placeholders})"
 
 def get_table_columns(cursor, table_name: str, schema: Optional[str] = None) -> List[str]:
     """Get column names for the table"""
-    table_identifier = f"{schema}.{table_name}" if schema else table_name
-    cursor.execute(f"SELECT * FROM {table_identifier} WHERE 1=0")
+    cursor.execute(f"SELECT * FROM {oracle_table_identifier(table_name, schema)} WHERE 1=0")
     return [desc[0] for desc in cursor.description]
 
-def save_chunk_to_csv(filename: str, columns: List[str], data: List[Dict[str, Any]]) -> None:
-    """Save chunk data to a CSV file"""
-    print(f"Saving {len(data)} rows to {filename}")
+def _bulk_fetch_cursor(conn: cx_Oracle.Connection) -> cx_Oracle.Cursor:
+    """Open an Oracle cursor sized for streaming whole tables"""
+    cursor = conn.cursor()
+    cursor.arraysize = FETCH_BATCH_SIZE
+    # The execute round-trip already brings back the first full batch
+    cursor.prefetchrows = FETCH_BATCH_SIZE
+    cursor.outputtypehandler = _fetch_lobs_inline
+    return cursor
+
+def _bulk_insert_cursor(conn: pyodbc.Connection) -> pyodbc.Cursor:
+    """Open a SQL Server cursor that binds each executemany batch as one parameter array"""
+    cursor = conn.cursor()
+    cursor.fast_executemany = True
+    return cursor
+
+def _fetch_lobs_inline(cursor, name, default_type, size, precision, scale):
+    """Output type handler: fetch CLOBs as strings and BLOBs as bytes, not LOB locators,
+    and NUMBER(p, s) as exact Decimals rather than floats"""
+    if default_type in (cx_Oracle.DB_TYPE_CLOB, cx_Oracle.DB_TYPE_NCLOB):
+        return cursor.var(cx_Oracle.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    if default_type == cx_Oracle.DB_TYPE_BLOB:
+        return cursor.var(cx_Oracle.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+    if default_type == cx_Oracle.DB_TYPE_NUMBER and not (precision and scale == 0):
+        # Unconstrained NUMBER and FLOAT can exceed any DECIMAL, so they come
+        # back as floats; int would otherwise be returned for whole values
+        value_type = Decimal if _is_exact_decimal(precision, scale) else float
+        return cursor.var(value_type, arraysize=cursor.arraysize)
+
+def _iter_csv_batches(cursor, max_rows: Optional[int] = None) -> Iterator[List[Sequence[Any]]]:
+    """Yield up to max_rows of the cursor's rows in fetchmany batches, decoding binary columns to text"""
+    binary_columns = [
+        i for i, desc in enumerate(cursor.description) if desc[1] in _BINARY_TYPES
+    ]
+    remaining = max_rows
+    while remaining is None or remaining > 0:
+        batch = cursor.fetchmany(cursor.arraysize if remaining is None else min(cursor.arraysize, remaining))
+        if not batch:
+            break
+        if remaining is not None:
+            remaining -= len(batch)
+        if binary_columns:
+            batch = [list(row) for row in batch]
+            for row in batch:
+                for i in binary_columns:
+                    if row[i] is not None:
+                        row[i] = row[i].decode('utf-8', errors='replace')
+        yield batch  # csv.writer already writes None as an empty field
+
+_END_OF_BATCHES = object()
+
+def _prefetch(batches: Iterator[Any], executor: ThreadPoolExecutor, depth: int = PREFETCH_DEPTH) -> Iterator[Any]:
+    """Drive a batch iterator on the executor's thread, keeping up to depth batches ready"""
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    break
+                buffer.put(batch)
+        finally:
+            buffer.put(_END_OF_BATCHES)
+    
+    producer = executor.submit(produce)
+    exhausted = False
+    try:
+        while True:
+            batch = buffer.get()
+            if batch is _END_OF_BATCHES:
+                exhausted = True
+                break
+            yield batch
+    finally:
+        if not exhausted:
+            # Consumer bailed out early: unblock the producer and let it finish
+            stop.set()
+            while buffer.get() is not _END_OF_BATCHES:
+                pass
+    producer.result()  # Re-raise fetch errors in the consumer
+
+def chunk_file_path(directory: str, chunk_num: int) -> str:
+    """Name a chunk file, with the suffix of the configured format and compression"""
+    if CHUNK_FORMAT == "parquet":
+        return os.path.join(directory, f"chunk_{chunk_num}.parquet")
+    return os.path.join(directory, f"chunk_{chunk_num}{_CHUNK_SUFFIXES.get(CHUNK_COMPRESSION, '.csv')}")
+
+def open_chunk_file(path: str, mode: str) -> io.TextIOWrapper:
+    """Open a chunk file as CSV text ('r' or 'w'), compressing by its suffix"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', compresslevel=1, encoding='utf-8', newline='')
+    if path.endswith('.lz4'):
+        return lz4.frame.open(path, mode + 't', encoding='utf-8', newline='')
+    
+    raw = open(path, mode + 'b', buffering=CSV_BUFFER_SIZE)
+    if mode == 'r' and hasattr(os, 'posix_fadvise'):
+        # Chunk files are read once front to back; let the kernel read ahead
+        os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    stream = raw
+    if path.endswith('.zst'):
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(raw)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw)
+    return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+def save_chunk(
+    filename: str,
+    columns: List[str],
+    description: Sequence[Sequence[Any]],
+    batches: Iterable[List[Sequence[Any]]]
+) -> int:
+    """Write row batches to a chunk file in the format its suffix names"""
+    if filename.endswith('.parquet'):
+        return save_chunk_to_parquet(filename, columns, description, batches)
+    return save_chunk_to_csv(filename, columns, description, batches)
+
+def save_chunk_to_parquet(
+    filename: str,
+    columns: List[str],
+    description: Sequence[Sequence[Any]],
+    batches: Iterable[List[Sequence[Any]]]
+) -> int:
+    """Stream row batches to a zstd-compressed Parquet file; returns the number of rows written"""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    
+    arrow_schema = pyarrow.schema([(col, _arrow_type(desc)) for col, desc in zip(columns, description)])
+    row_count = 0
+    with pyarrow.parquet.ParquetWriter(filename, arrow_schema, compression='zstd') as writer:
+        for batch in batches:
+            # Transpose the fetched rows into one typed array per column
+            arrays = [_arrow_array(values, field.type) for values, field in zip(zip(*batch), arrow_schema)]
+            writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=arrow_schema))
+            row_count += len(batch)
+    
+    print(f"Saved {row_count} rows to {filename}")
+    return row_count
+
+def _arrow_array(values: Sequence[Any], type_):
+    try:
+        return pyarrow.array(values, type=type_)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        if type_ != pyarrow.string():
+            raise
+        # Intervals, ROWIDs and other values without an Arrow type of their own
+        return pyarrow.array([None if value is None else str(value) for value in values], type=type_)
+
+def save_chunk_to_csv(
+    filename: str,
+    columns: List[str],
+    description: Sequence[Sequence[Any]],
+    batches: Iterable[List[Sequence[Any]]]
+) -> int:
+    """Stream row batches to a CSV file under a header row; returns the number of rows written"""
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-        writer.writerows(data)
+    # str() of a Decimal may use an exponent (1E-7, 0E-10), which neither
+    # BULK INSERT nor the DECIMAL conversion of a bound string accepts
+    decimal_columns = [
+        i for i, (_, type_, _, _, precision, scale, _) in enumerate(description)
+        if type_ == cx_Oracle.DB_TYPE_NUMBER and _is_exact_decimal(precision, scale)
+    ]
+    row_count = 0
+    with open_chunk_file(filename, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for batch in batches:
+            if decimal_columns:
+                batch = [list(row) for row in batch]
+                for row in batch:
+                    for i in decimal_columns:
+                        if row[i] is not None:
+                            row[i] = format(row[i], 'f')
+            writer.writerows(batch)
+            row_count += len(batch)
     
-    print(f"Saved chunk to {filename}")
\ No newline at end of file
+    print(f"Saved {row_count} rows to {filename}")
+    return row_count
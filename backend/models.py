@@ -1,7 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Literal, Optional, List
 
+# Schema models are shared between callers through the schema cache,
+# so they are frozen to keep one request from mutating another's result
 class DatabaseColumn(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     type: str
     nullable: bool
@@ -9,16 +13,20 @@ class DatabaseColumn(BaseModel):
     selected: bool = True
 
 class DatabaseTable(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     schema: Optional[str] = None
     rowCount: Optional[int] = 0
     columns: List[DatabaseColumn]
     selected: bool = False
 
+ConnectionKind = Literal["mssql", "oracle", "sqlite"]
+
 class Connection(BaseModel):
     id: str
     name: str
-    type: str
+    type: ConnectionKind
     host: Optional[str] = None
     port: Optional[int] = None
     username: Optional[str] = None
@@ -30,18 +38,22 @@ class SearchParams(BaseModel):
     search: Optional[str] = None
     limit: Optional[int] = 10
     offset: Optional[int] = 0
-
-class MigrationChunk(BaseModel):
-    table_name: str
-    schema: Optional[str]
-    chunk_number: int
-    total_chunks: int
-    rows: List[dict]
+    exact_count: bool = False  # Scan views that have no optimizer statistics
+    # Keyset paging: continue after the last view of the previous page
+    after_schema: Optional[str] = None
+    after_name: Optional[str] = None
 
 class MigrationRequest(BaseModel):
     source_connection_id: str
     destination_connection_id: str
     table_name: str
     schema: Optional[str]
-    chunk_size: int = 1000000  # Default to 1M rows per chunk
-    selected_columns: List[str]
\ No newline at end of file
+    chunk_size: int = 131072  # Small enough for staged chunks to overlap extract and import
+    selected_columns: List[str]
+    stage_chunks: bool = False  # Stage chunk files (CHUNK_FORMAT) and import them, instead of streaming directly
+    
+    @field_validator("chunk_size")
+    @classmethod
+    def clamp_chunk_size(cls, value: int) -> int:
+        """Keep chunks between 1K rows (per-file overhead) and 1M rows (per-chunk memory)"""
+        return max(1024, min(value, 1048576))
\ No newline at end of file
@@ -0,0 +1,171 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Hashable, Iterator, Tuple
+import pyodbc
+import cx_Oracle
+
+# SQL Server connections are pooled here rather than by the ODBC driver
+# manager, whose pooling grows without bound under some drivers.
+# Must be set before the first pyodbc.connect call.
+pyodbc.pooling = False
+
+MSSQL_POOL_MAX = int(os.environ.get("MSSQL_POOL_MAX", "10"))
+# Connections idle longer than this are probed before reuse, so one left
+# stale by a server restart or network drop is replaced, not handed out
+MSSQL_IDLE_PROBE_SECONDS = float(os.environ.get("MSSQL_IDLE_PROBE_SECONDS", "30"))
+
+ORACLE_POOL_MIN = int(os.environ.get("ORACLE_POOL_MIN", "2"))
+ORACLE_POOL_MAX = int(os.environ.get("ORACLE_POOL_MAX", "10"))
+# Parsed statements kept per session, keyed by SQL text
+ORACLE_STMT_CACHE_SIZE = int(os.environ.get("ORACLE_STMT_CACHE_SIZE", "50"))
+
+_oracle_client_initialized = False
+
+def init_oracle_client() -> None:
+    """Initialize the Oracle client library once per process"""
+    global _oracle_client_initialized
+    if _oracle_client_initialized:
+        return
+    os.environ["NLS_LANG"] = ".AL32UTF8"
+    try:
+        cx_Oracle.init_oracle_client()
+    except Exception as e:
+        if "Oracle Client library has already been initialized" not in str(e):
+            raise
+    _oracle_client_initialized = True
+
+# Idle (connection, idle_since) pairs per connection string and connect
+# options, so a connection opened with a timeout or autocommit is only
+# handed to callers that asked for the same
+_mssql_pools: Dict[Tuple[str, FrozenSet[Tuple[str, Hashable]]], queue.LifoQueue] = {}
+_mssql_pools_lock = threading.Lock()
+
+_oracle_pools: Dict[str, cx_Oracle.SessionPool] = {}
+_oracle_pools_lock = threading.Lock()
+# Connection.call_timeout needs an 18c or newer client (DPI-1050 otherwise);
+# checked once when the first pool is created
+_oracle_call_timeout_supported = False
+
+# Applied once to each new pooled session rather than on every request
+_ORACLE_SESSION_SETUP = (
+    "ALTER SESSION SET NLS_LENGTH_SEMANTICS = 'CHAR'",
+    "ALTER SESSION SET NLS_DATE_FORMAT = 'YYYY-MM-DD HH24:MI:SS'",
+    "ALTER SESSION SET QUERY_REWRITE_ENABLED = TRUE"
+)
+
+def _init_oracle_session(conn: cx_Oracle.Connection, requested_tag: str) -> None:
+    """Session callback: cx_Oracle calls this only for freshly created sessions"""
+    cursor = conn.cursor()
+    for statement in _ORACLE_SESSION_SETUP:
+        cursor.execute(statement)
+    cursor.close()
+
+def parse_oracle_connection_string(connection_string: str) -> Tuple[str, str, str]:
+    """Split a 'user/password@dsn' connection string into its parts"""
+    credentials, dsn = connection_string.rsplit('@', 1)
+    user, password = credentials.split('/', 1)
+    return user, password, dsn
+
+def get_oracle_pool(connection_string: str) -> cx_Oracle.SessionPool:
+    """Get (or lazily create) the session pool for a connection string"""
+    global _oracle_call_timeout_supported
+    pool = _oracle_pools.get(connection_string)
+    if pool is not None:
+        return pool
+
+    with _oracle_pools_lock:
+        pool = _oracle_pools.get(connection_string)
+        if pool is None:
+            user, password, dsn = parse_oracle_connection_string(connection_string)
+            pool = cx_Oracle.SessionPool(
+                user,
+                password,
+                dsn,
+                min=ORACLE_POOL_MIN,
+                max=ORACLE_POOL_MAX,
+                increment=1,
+                threaded=True,
+                getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT,
+                encoding="UTF-8",
+                sessionCallback=_init_oracle_session
+            )
+            pool.stmtcachesize = ORACLE_STMT_CACHE_SIZE
+            _oracle_call_timeout_supported = cx_Oracle.clientversion() >= (18,)
+            _oracle_pools[connection_string] = pool
+        return pool
+
+def oracle_call_timeout_supported() -> bool:
+    """Whether pooled sessions accept call_timeout"""
+    return _oracle_call_timeout_supported
+
+@contextmanager
+def oracle_connection(connection_string: str) -> Iterator[cx_Oracle.Connection]:
+    """Acquire a pooled Oracle session and release it back when done"""
+    pool = get_oracle_pool(connection_string)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        try:
+            pool.release(conn)
+        except cx_Oracle.Error:
+            pass
+
+def _get_mssql_pool(connection_string: str, connect_kwargs: dict) -> queue.LifoQueue:
+    key = (connection_string, frozenset(connect_kwargs.items()))
+    idle = _mssql_pools.get(key)
+    if idle is None:
+        with _mssql_pools_lock:
+            idle = _mssql_pools.setdefault(key, queue.LifoQueue(maxsize=MSSQL_POOL_MAX))
+    return idle
+
+@contextmanager
+def mssql_connection(connection_string: str, **connect_kwargs) -> Iterator[pyodbc.Connection]:
+    """Borrow an idle SQL Server connection, opening a new one if none is free.
+
+    Connections that raised (or were abandoned by a cancelled caller) are
+    closed rather than returned, so a dropped link is never handed to the
+    next caller.
+    """
+    idle = _get_mssql_pool(connection_string, connect_kwargs)
+    conn = _borrow_mssql_connection(idle, connection_string, connect_kwargs)
+
+    try:
+        yield conn
+        conn.rollback()
+    except BaseException:
+        _close_quietly(conn)
+        raise
+
+    try:
+        idle.put_nowait((conn, time.monotonic()))
+    except queue.Full:
+        conn.close()
+
+def _borrow_mssql_connection(idle: queue.LifoQueue, connection_string: str, connect_kwargs: dict) -> pyodbc.Connection:
+    """Reuse the most recently idle connection, probing it first if it sat idle too long"""
+    while True:
+        try:
+            conn, idle_since = idle.get_nowait()
+        except queue.Empty:
+            conn = pyodbc.connect(connection_string, **connect_kwargs)
+            # No "n rows affected" message after every statement in a batch
+            conn.execute("SET NOCOUNT ON")
+            return conn
+
+        if time.monotonic() - idle_since < MSSQL_IDLE_PROBE_SECONDS:
+            return conn
+        try:
+            conn.execute("SELECT 1").fetchall()
+            return conn
+        except pyodbc.Error:
+            _close_quietly(conn)
+
+def _close_quietly(conn: pyodbc.Connection) -> None:
+    try:
+        conn.close()
+    except pyodbc.Error:
+        pass
@@ -0,0 +1,13 @@
+from typing import Optional
+
+# Identifiers can't be bound, so names are always spliced in quoted form;
+# the statement text then only varies with the table, never with the data
+def quote_oracle(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def oracle_table_identifier(table_name: str, schema: Optional[str] = None) -> str:
+    table = quote_oracle(table_name)
+    return f"{quote_oracle(schema)}.{table}" if schema else table
+
+def quote_mssql(name: str) -> str:
+    return '[' + name.replace(']', ']]') + ']'
@@ -5,11 +5,15 @@ import TableList from '../components/Tables/TableList';
 import { ChevronRight, ChevronLeft, RefreshCw } from 'lucide-react';
 import { DatabaseTable } from '../types/database';
 
+// Views fetched per search page
+const SEARCH_PAGE_SIZE = 10;
+
 const TablesPage: React.FC = () => {
   const { state, dispatch } = useAppContext();
   const [isLoading, setIsLoading] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const [searchResults, setSearchResults] = useState<DatabaseTable[]>([]);
+  const [hasMoreResults, setHasMoreResults] = useState(false);
   
   useEffect(() => {
     if (
@@ -33,19 +37,26 @@ const TablesPage: React.FC = () => {
     }
   }, [searchQuery]);
   
-  const searchViews = async () => {
+  // Without `after` this starts a new search; with it, the next page is
+  // appended after that view, keeping the selections already made
+  const searchViews = async (after?: DatabaseTable) => {
     if (!state.sourceConnection) return;
     
     setIsLoading(true);
     try {
       const results = await searchOracleViews(
         state.sourceConnection.id,
-        searchQuery
+        searchQuery,
+        SEARCH_PAGE_SIZE,
+        0,
+        after
       );
-      setSearchResults(results);
+      const tables = after ? [...state.sourceSchema.tables, ...results] : results;
+      setSearchResults(tables);
+      setHasMoreResults(results.length === SEARCH_PAGE_SIZE);
       dispatch({ 
         type: 'SET_SOURCE_SCHEMA', 
-        payload: { tables: results, loading: false } 
+        payload: { tables, loading: false } 
       });
     } catch (error) {
       console.error('Error searching views:', error);
@@ -120,6 +131,7 @@ const TablesPage: React.FC = () => {
     setSearchQuery(query);
     if (state.sourceConnection?.type === 'oracle' && query.length < 2) {
       setSearchResults([]);
+      setHasMoreResults(false);
       dispatch({ 
         type: 'SET_SOURCE_SCHEMA', 
         payload: { tables: [], loading: false } 
@@ -203,11 +215,23 @@ const TablesPage: React.FC = () => {
           No tables found in the source database. Please check your connection or permissions.
         </div>
       ) : (
-        <TableList
-          tables={state.sourceSchema.tables}
-          onSelectTable={handleSelectTable}
-          onSelectColumn={handleSelectColumn}
-        />
+        <>
+          <TableList
+            tables={state.sourceSchema.tables}
+            onSelectTable={handleSelectTable}
+            onSelectColumn={handleSelectColumn}
+          />
+          {state.sourceConnection.type === 'oracle' && hasMoreResults && (
+            <div className="mt-4 flex justify-center">
+              <button
+                onClick={() => searchViews(state.sourceSchema.tables[state.sourceSchema.tables.length - 1])}
+                className="inline-flex items-center px-3 py-2 border border-gray-300 shadow-sm text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-teal-500"
+              >
+                Load more views
+              </button>
+            </div>
+          )}
+        </>
       )}
       
       <div className="mt-6 flex justify-between">
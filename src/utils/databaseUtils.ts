@@ -86,7 +86,8 @@ export const searchOracleViews = async (
   connectionId: string,
   searchQuery: string,
   limit: number = 10,
-  offset: number = 0
+  offset: number = 0,
+  after?: Pick<DatabaseTable, 'schema' | 'name'>
 ): Promise<DatabaseTable[]> => {
   try {
     const response = await fetch(`http://localhost:8000/api/connections/${connectionId}/search`, {
@@ -97,7 +98,11 @@ export const searchOracleViews = async (
       body: JSON.stringify({
         search: searchQuery,
         limit,
-        offset
+        // Continue after the last view of the previous page; the backend
+        // ignores the offset for a keyset page
+        offset: after ? 0 : offset,
+        after_schema: after?.schema,
+        after_name: after?.name
       })
     });
     
@@ -27,7 +27,7 @@ export const createMigrationConfig = (
     status: 'draft',
     options: {
       truncateBeforeInsert: options.truncateBeforeInsert ?? false,
-      batchSize: options.batchSize ?? 1000000, // Default to 1M rows
+      batchSize: options.batchSize ?? 131072, // Default to 128K rows
       skipErrors: options.skipErrors ?? false,
       validateBeforeMigration: options.validateBeforeMigration ?? true,
       useCsvExtraction: true // Always use CSV extraction
@@ -88,64 +88,105 @@ export const formatDuration = (seconds: number): string => {
   }
 };
 
+// Tables migrated at once; each request runs on its own backend connections
+const MAX_PARALLEL_TABLES = 4;
+
+// Migrate one table and return the number of rows copied
+const migrateTable = async (
+  config: MigrationConfig,
+  table: MigrationTable
+): Promise<number> => {
+  const response = await fetch('http://localhost:8000/api/migration/start', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      source_connection_id: config.sourceConnectionId,
+      destination_connection_id: config.destinationConnectionId,
+      table_name: table.name,
+      schema: table.schema,
+      chunk_size: config.options.batchSize,
+      selected_columns: table.selectedColumns
+    })
+  });
+
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.detail || 'Failed to start migration');
+  }
+
+  const result = await response.json();
+  return result.rows_migrated ?? result.chunks_processed * config.options.batchSize;
+};
+
 // Function to start migration process
 export const runMigration = async (
   config: MigrationConfig,
   onProgress: (progress: MigrationProgress) => void
 ): Promise<void> => {
-  let progress = initializeMigrationProgress(config.id, config.selectedTables);
+  const tables = config.selectedTables;
+  let progress = initializeMigrationProgress(config.id, tables);
   onProgress(progress);
 
-  try {
-    const response = await fetch('http://localhost:8000/api/migration/start', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        source_connection_id: config.sourceConnectionId,
-        destination_connection_id: config.destinationConnectionId,
-        table_name: config.selectedTables[0].name,
-        schema: config.selectedTables[0].schema,
-        chunk_size: config.options.batchSize,
-        selected_columns: config.selectedTables[0].selectedColumns
-      })
-    });
+  let nextTable = 0;
+  let firstError: unknown = null;
 
-    if (!response.ok) {
-      const error = await response.json();
-      throw new Error(error.detail || 'Failed to start migration');
+  // Each worker takes the next pending table until none are left, or until
+  // a failure stops the run (unless errors are being skipped)
+  const worker = async () => {
+    while (nextTable < tables.length && !firstError) {
+      const table = tables[nextTable++];
+      try {
+        const rows = await migrateTable(config, table);
+        const processedTables = progress.processedTables + 1;
+        progress = {
+          ...progress,
+          processedTables,
+          processedRows: progress.processedRows + rows,
+          overallProgress: Math.round((processedTables / tables.length) * 100)
+        };
+      } catch (error) {
+        if (!config.options.skipErrors) {
+          firstError = firstError ?? error;
+        }
+        progress = {
+          ...progress,
+          errors: [
+            ...progress.errors,
+            {
+              table: table.name,
+              message: error.message,
+              timestamp: new Date()
+            }
+          ]
+        };
+      }
+      onProgress(progress);
     }
+  };
 
-    const result = await response.json();
-    
-    // Update progress with actual data
-    progress = {
-      ...progress,
-      processedRows: result.chunks_processed * config.options.batchSize,
-      currentTableProgress: 100,
-      overallProgress: 100,
-      status: 'completed',
-      endTime: new Date(),
-      estimatedTimeRemaining: 0
-    };
-    
-    onProgress(progress);
-  } catch (error) {
+  await Promise.all(
+    Array.from({ length: Math.min(MAX_PARALLEL_TABLES, tables.length) }, worker)
+  );
+
+  if (firstError) {
     progress = {
       ...progress,
       status: 'failed',
-      endTime: new Date(),
-      errors: [
-        ...progress.errors,
-        {
-          table: config.selectedTables[0].name,
-          message: error.message,
-          timestamp: new Date()
-        }
-      ]
+      endTime: new Date()
     };
     onProgress(progress);
-    throw error;
+    throw firstError;
   }
-};
\ No newline at end of file
+
+  progress = {
+    ...progress,
+    currentTableProgress: 100,
+    overallProgress: 100,
+    status: 'completed',
+    endTime: new Date(),
+    estimatedTimeRemaining: 0
+  };
+  onProgress(progress);
+};